@@ -25,7 +25,6 @@ Returns:
     A CSV file saved to the script_output folder with collection metadata from Archive-It.
 """
 from datetime import datetime
-import requests
 import sys
 try:
     import configuration as c
@@ -42,7 +41,7 @@ def get_metadata():
     Returns:
         Collection metadata (json)
     """
-    collections_metadata = requests.get(f'{c.partner_api}/collection?limit=-1', auth=(c.username, c.password))
+    collections_metadata = fun.api_get(f'{c.partner_api}/collection?limit=-1')
     if not collections_metadata.status_code == 200:
         print('Error with Archive-It API connection when getting collection metadata', collections_metadata.status_code)
         exit()
@@ -109,12 +108,17 @@ if __name__ == '__main__':
     # Gets the metadata for all collections from the Archive-It Partner API.
     collections = get_metadata()
 
+    # Saves the collections to the metadata cache (if configured) so other scripts can use them without the API.
+    fun.cache_save(fun.cache_connect(), 'collection', {str(collection['id']): collection for collection in collections})
+
     # Makes a CSV for the collection metadata report with a header row.
     report_path = f"{c.script_output}/collection_metadata_{datetime.today().strftime('%Y-%m-%d')}.csv"
+    # The report stays open while the rows are added, which are saved in batches.
     header = get_header(include_optional)
-    fun.save_csv_row(report_path, header)
+    with fun.ReportWriter(report_path) as report:
+        report.writerow(header)
 
-    # Saves the metadata for each collection to the collection metadata report.
-    for collection in collections:
-        collection_row = make_metadata_list(collection, header)
-        fun.save_csv_row(report_path, collection_row)
+        # Saves the metadata for each collection to the collection metadata report.
+        for collection in collections:
+            collection_row = make_metadata_list(collection, header)
+            report.writerow(collection_row)
@@ -12,3 +12,35 @@ wasapi = 'https://warcs.archive-it.org/wasapi/v1/webdata'
 inst_page = 'https://partner.archive-it.org/INSERT-NUMBER'
 username = 'INSERT-USERNAME'
 password = 'INSERT-PASSWORD'
+
+# Optional. Folder where Archive-It data is cached between runs and shared by the scripts:
+# seed, collection, and crawl job data and WASAPI results for date ranges that are entirely in the past.
+# If this variable is not included, data is only cached while a script is running.
+# cache_folder = 'INSERT-PATH'
+
+# Optional. Hours that seed, collection, and crawl job data in the cache_folder is used before it is requested again.
+# None means there is no limit. These are the defaults if this variable is not included.
+# cache_hours = {'seed': 1, 'collection': 1, 'crawl_job': None}
+
+# Optional. Hours that ids that are not in Archive-It, such as deleted seeds, are remembered in the cache_folder
+# before they are requested again. None means there is no limit. These are the defaults.
+# missing_cache_hours = {'seed': 24, 'collection': 24, 'crawl_job': None}
+
+# Optional. Most connections kept open to each Archive-It API, which should be at least the number of API calls
+# made at the same time, and seconds to wait for an API response before stopping. These are the defaults.
+# http_pool_size = 20
+# http_timeout = 120
+
+# Optional. Most times to try an API call that has a temporary error, such as too many requests,
+# and the most seconds to spend trying before using the error. These are the defaults.
+# retry_attempts = 5
+# retry_seconds = 300
+
+# Optional. Most API calls per second to make to the Partner API and to WASAPI, shared by all the workers.
+# None means there is no limit, which is the default if this variable is not included.
+# rate_limits = {'partner_api': None, 'wasapi': None}
+
+# Optional. For the WARC report hedge option: the percentile of recent response times to wait before sending
+# a duplicate seed or crawl job API call, and the most duplicates as a fraction of API calls. These are the defaults.
+# hedge_percentile = 95
+# hedge_max_extra = 0.05
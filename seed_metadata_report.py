@@ -25,7 +25,6 @@ Returns:
     A CSV file saved to the script_output folder with seed metadata from Archive-It.
 """
 from datetime import datetime
-import requests
 import sys
 try:
     import configuration as c
@@ -42,7 +41,7 @@ def get_metadata():
     Returns:
         Seed metadata (json)
     """
-    seeds_metadata = requests.get(f'{c.partner_api}/seed?limit=-1', auth=(c.username, c.password))
+    seeds_metadata = fun.api_get(f'{c.partner_api}/seed?limit=-1')
     if not seeds_metadata.status_code == 200:
         print('Error with Archive-It API connection when getting seed metadata', seeds_metadata.status_code)
         exit()
@@ -110,12 +109,20 @@ if __name__ == '__main__':
     # Gets the seeds' metadata from the Archive-It Partner API.
     seeds = get_metadata()
 
+    # Saves the seeds to the metadata cache (if configured) so other scripts can use them without the API,
+    # and the number of seeds in the account, which the WARC report uses to choose how to get seeds.
+    cache_connection = fun.cache_connect()
+    fun.cache_save(cache_connection, 'seed', {str(seed['id']): seed for seed in seeds})
+    fun.cache_save_count(cache_connection, 'seed', len(seeds))
+
     # Makes a CSV for the seed metadata report with a header row.
     report_path = f"{c.script_output}/seed_metadata_{datetime.today().strftime('%Y-%m-%d')}.csv"
+    # The report stays open while the rows are added, which are saved in batches.
     header = get_header(include_optional)
-    fun.save_csv_row(report_path, header)
+    with fun.ReportWriter(report_path) as report:
+        report.writerow(header)
 
-    # Saves the metadata for each seed to the seed metadata report.
-    for seed in seeds:
-        seed_row = make_metadata_list(seed, header)
-        fun.save_csv_row(report_path, seed_row)
+        # Saves the metadata for each seed to the seed metadata report.
+        for seed in seeds:
+            seed_row = make_metadata_list(seed, header)
+            report.writerow(seed_row)
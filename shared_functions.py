@@ -1,10 +1,273 @@
 """Functions used by more than one script for working with the Archive-It APIs."""
+import asyncio
+import atexit
+import codecs
+from collections import deque
+from concurrent.futures import as_completed, Future, ThreadPoolExecutor, wait
+import contextlib
+import functools
 import csv
+from email.utils import parsedate_to_datetime
+import json
 import os
+import queue
+import random
 import requests
+import sqlite3
 import sys
+import threading
+import time
 import configuration as c
 
+# The requests session shared by every API call, which is made the first time it is needed by get_session().
+session = None
+
+# Rate limiters for each Archive-It API, which are made the first time they are needed by get_rate_limiter().
+rate_limiters = {}
+
+# The event loop (running in its own thread) and aiohttp session shared by every async API call,
+# which are made the first time they are needed by get_async_loop().
+async_loop = None
+async_session = None
+
+# Lock for making the shared objects above (the requests session, rate limiters, and event loop) the first time
+# they are needed, since more than one thread can need them at the same time and each must only be made once.
+setup_lock = threading.Lock()
+
+# Lock for using the metadata cache, since the same connection can be used by more than one thread.
+cache_lock = threading.Lock()
+
+# Concurrency controllers for each Archive-It API, which a script adds to limit (and optionally adapt)
+# how many API calls to that API are made at the same time by every thread (see ConcurrencyController).
+concurrency_controllers = {}
+
+# Request hedger used by api_get_hedged(), which a script adds to turn on hedging (see RequestHedger).
+hedger = None
+
+# Status codes for API errors that are usually temporary, so the API call is tried again.
+retry_status_codes = (429, 500, 502, 503, 504)
+
+# aiohttp is only needed for the optional async backend, so the scripts still run if it is not installed.
+try:
+    import aiohttp
+except ModuleNotFoundError:
+    aiohttp = None
+
+# Errors raised by API calls that did not get a response, even after trying again (see api_get()).
+api_errors = (requests.exceptions.RequestException,)
+if aiohttp:
+    api_errors += (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+def api_get(url, params=None, auth=True, stream=False):
+    """Make an API call with the shared requests session, which reuses connections, and a timeout.
+
+    API calls to the Partner API and WASAPI wait for their rate limiter first, if one is configured
+    (see get_rate_limiter()), and for their concurrency controller, if the script added one,
+    including each time an API call is tried again.
+
+    If the API call has a temporary error (a status code in retry_status_codes, a timeout, or a connection error),
+    it is tried again after waiting, which gets longer with each attempt (see get_retry_delay()).
+    The optional retry_attempts and retry_seconds configuration variables are the most times to try the API call
+    and the most seconds to spend trying. After that, the last response is returned or the last error is raised.
+
+    Parameters:
+        url : API URL
+        params : dictionary of API parameters, or None
+        auth : if the Archive-It username and password should be included (Boolean)
+        stream : if the response body should be read by the caller as it arrives instead of all at once (Boolean)
+
+    Returns:
+        The API response.
+    """
+    credentials = (c.username, c.password) if auth else None
+    attempts = get_setting('retry_attempts', 5)
+    deadline = time.monotonic() + get_setting('retry_seconds', 300)
+    rate_limiter = get_rate_limiter(url)
+    controller = concurrency_controllers.get(get_api_name(url))
+    for attempt in range(1, attempts + 1):
+        if rate_limiter:
+            time.sleep(rate_limiter.reserve())
+        if controller:
+            controller.acquire()
+        started = time.monotonic()
+        response = None
+        try:
+            response = get_session().get(url, params=params, auth=credentials, stream=stream,
+                                         timeout=get_setting('http_timeout', 120))
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            delay = get_retry_delay(attempt)
+            if attempt == attempts or time.monotonic() + delay > deadline:
+                raise
+        else:
+            if response.status_code not in retry_status_codes:
+                return response
+            delay = get_retry_delay(attempt, response.status_code, response.headers.get('Retry-After'))
+            if attempt == attempts or time.monotonic() + delay > deadline:
+                return response
+            response.close()
+        finally:
+            if controller:
+                controller.release(response.status_code if response is not None else None,
+                                   time.monotonic() - started)
+        time.sleep(delay)
+
+
+def api_get_hedged(url, params=None):
+    """Make an API call with api_get(), sending a duplicate API call if it is slow and the hedger is turned on.
+
+    Only use this for API calls that can safely be made twice, such as getting a seed or crawl job.
+    If the script has not added a RequestHedger to the hedger variable, this is the same as api_get().
+
+    Parameters:
+        url : API URL
+        params : dictionary of API parameters, or None
+
+    Returns:
+        The API response that arrived first.
+    """
+    if hedger is None:
+        return api_get(url, params)
+    return hedger.get(url, params)
+
+
+def cache_connect():
+    """Connect to the metadata cache, a SQLite database in the cache_folder, making it if it does not exist.
+
+    The metadata cache saves Partner API data for seeds, collections, and crawl jobs between runs
+    so the scripts can share it, for example a WARC report can use the seeds saved by a seed report.
+    Ids that are not in Archive-It, such as deleted seeds, are saved in a separate table (missing)
+    so they can be kept for a different amount of time than the data.
+    The number of ids of a record type in the account is saved in another table (counts), by a script that gets them all.
+
+    Returns:
+        Connection to the metadata cache, or None if there is no cache_folder in the configuration file.
+    """
+    if not hasattr(c, 'cache_folder'):
+        return None
+    # The connection may be used by other threads than the one that made it, such as run_pipeline() workers,
+    # so the functions that use it only do so while holding cache_lock.
+    connection = sqlite3.connect(os.path.join(c.cache_folder, 'metadata_cache.sqlite'), check_same_thread=False)
+    connection.execute('CREATE TABLE IF NOT EXISTS records (record_type TEXT, record_id TEXT, data TEXT, '
+                       'fetched REAL, PRIMARY KEY (record_type, record_id))')
+    connection.execute('CREATE TABLE IF NOT EXISTS missing (record_type TEXT, record_id TEXT, '
+                       'fetched REAL, PRIMARY KEY (record_type, record_id))')
+    connection.execute('CREATE TABLE IF NOT EXISTS counts (record_type TEXT PRIMARY KEY, count INTEGER, fetched REAL)')
+    return connection
+
+
+def cache_count(connection, record_type):
+    """Get the number of ids of a record type in the account, saved by the last script that got all of them.
+
+    For example, the seed report saves the number of seeds in the account. The number is used no matter when it was
+    saved, since it only needs to be about right.
+
+    Parameters:
+        connection : connection to the metadata cache, or None if there is no metadata cache
+        record_type : type of Partner API data, for example seed, collection, or crawl_job
+
+    Returns:
+        The number of ids, or None if there is no metadata cache or the number was not saved.
+    """
+    if connection is None:
+        return None
+    with cache_lock:
+        row = connection.execute('SELECT count FROM counts WHERE record_type = ?', [record_type]).fetchone()
+    return row[0] if row else None
+
+
+def cache_get(connection, record_type, record_ids):
+    """Get API data from the metadata cache for a list of ids, if it was saved recently enough to use.
+
+    How long data is used depends on the record type and is set by the optional cache_hours configuration variable.
+    How long ids that are not in Archive-It are used is set separately by the optional missing_cache_hours variable.
+
+    Parameters:
+        connection : connection to the metadata cache, or None if there is no metadata cache
+        record_type : type of Partner API data, for example seed, collection, or crawl_job
+        record_ids : list of Archive-It ids
+
+    Returns:
+        Dictionary with the id (as a string) and API data for each id in the cache.
+        The data is None for ids that were saved as not being in Archive-It.
+    """
+    records = {}
+    if connection is None:
+        return records
+
+    # Ids saved before the oldest allowed time are not used. If the record type has no limit, every id is used.
+    hours = get_cache_hours(record_type)
+    oldest = time.time() - hours * 3600 if hours is not None else 0
+    missing_hours = get_cache_hours(record_type, missing=True)
+    missing_oldest = time.time() - missing_hours * 3600 if missing_hours is not None else 0
+
+    # Gets the ids in groups, since SQLite limits how many values can be in one query.
+    record_ids = [str(record_id) for record_id in record_ids]
+    with cache_lock:
+        for start in range(0, len(record_ids), 500):
+            chunk = record_ids[start:start + 500]
+            id_list = ','.join('?' * len(chunk))
+            rows = connection.execute(f"SELECT record_id, data FROM records WHERE record_type = ? AND fetched >= ? "
+                                      f"AND record_id IN ({id_list})", [record_type, oldest] + chunk)
+            for record_id, data in rows:
+                records[record_id] = json.loads(data)
+            rows = connection.execute(f"SELECT record_id FROM missing WHERE record_type = ? AND fetched >= ? "
+                                      f"AND record_id IN ({id_list})", [record_type, missing_oldest] + chunk)
+            for (record_id,) in rows:
+                records[record_id] = None
+    return records
+
+
+def cache_save(connection, record_type, records):
+    """Save API data to the metadata cache, replacing any data already saved for the same ids.
+
+    Ids that are not in Archive-It are saved to the missing table instead of with the data.
+
+    Parameters:
+        connection : connection to the metadata cache, or None if there is no metadata cache
+        record_type : type of Partner API data, for example seed, collection, or crawl_job
+        records : dictionary with the id and API data for each id, or None for ids that are not in Archive-It
+
+    Returns:
+        Nothing
+    """
+    if connection is None:
+        return
+    fetched = time.time()
+    found = [(record_type, str(record_id), json.dumps(data), fetched)
+             for record_id, data in records.items() if data is not None]
+    missing = [(record_type, str(record_id), fetched) for record_id, data in records.items() if data is None]
+
+    # An id is only in one table, so an id that was missing and is now found (or the reverse) uses the newest result.
+    with cache_lock:
+        connection.executemany('DELETE FROM missing WHERE record_type = ? AND record_id = ?',
+                               [row[:2] for row in found])
+        connection.executemany('DELETE FROM records WHERE record_type = ? AND record_id = ?',
+                               [row[:2] for row in missing])
+        connection.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)', found)
+        connection.executemany('INSERT OR REPLACE INTO missing VALUES (?, ?, ?)', missing)
+        connection.commit()
+
+
+def cache_save_count(connection, record_type, count):
+    """Save the number of ids of a record type in the account to the metadata cache, replacing any saved number.
+
+    Only save this after getting every id of the record type in the account, for example with limit=-1.
+
+    Parameters:
+        connection : connection to the metadata cache, or None if there is no metadata cache
+        record_type : type of Partner API data, for example seed, collection, or crawl_job
+        count : the number of ids
+
+    Returns:
+        Nothing
+    """
+    if connection is None:
+        return
+    with cache_lock:
+        connection.execute('INSERT OR REPLACE INTO counts VALUES (?, ?, ?)', [record_type, count, time.time()])
+        connection.commit()
+
 
 def check_config():
     """Check the configuration file is correct and if not quits the script.
@@ -21,6 +284,10 @@ def check_config():
     except AttributeError:
         errors.append("Variable 'script_output' is missing from the configuration file.")
 
+    # Checks if the path in cache_folder exists on the local machine, if this optional variable is included.
+    if hasattr(c, 'cache_folder') and not os.path.exists(c.cache_folder):
+        errors.append(f"Variable path '{c.cache_folder}' is not correct.")
+
     # Checks that the API URLs, which are consistent values, are correct.
     try:
         if c.partner_api != 'https://partner.archive-it.org/api':
@@ -35,7 +302,7 @@ def check_config():
 
     # Checks that the institution page exists.
     try:
-        response = requests.get(c.inst_page)
+        response = api_get(c.inst_page, auth=False)
         if response.status_code != 200:
             errors.append("Institution Page URL is not correct.")
     except AttributeError:
@@ -54,7 +321,7 @@ def check_config():
     # Checks that the Archive-It username and password are correct by using them with an API call.
     # This only works if the partner_api variable is in the configuration file.
     try:
-        response = requests.get(f'{c.partner_api}/seed?limit=5', auth=(c.username, c.password))
+        response = api_get(f'{c.partner_api}/seed?limit=5')
         if response.status_code != 200:
             errors.append("Could not access Partner API with provided credentials. "
                           "Check if the partner_api, username, and/or password variables have errors.")
@@ -86,6 +353,249 @@ def check_fields_to_include(args):
         return True
 
 
+def close_async_loop():
+    """Close the aiohttp session shared by the async API calls and stop its event loop.
+
+    This is run when the script ends, if get_async_loop() started the event loop.
+    There are no parameters and it returns nothing.
+    """
+    asyncio.run_coroutine_threadsafe(async_session.close(), async_loop).result(timeout=5)
+    async_loop.call_soon_threadsafe(async_loop.stop)
+
+
+def get_api_name(url):
+    """Get which Archive-It API a URL is for, to find the rate limiter and concurrency controller for that API.
+
+    Parameter:
+        url : API URL
+
+    Returns:
+        partner_api, wasapi, or None if the URL is not for either API.
+        An API that is missing from the configuration file is skipped, so check_config() can report it.
+    """
+    for api in ('partner_api', 'wasapi'):
+        api_url = getattr(c, api, None)
+        if api_url and url.startswith(api_url):
+            return api
+    return None
+
+
+def get_async_loop():
+    """Get the event loop shared by every async API call, starting it the first time this is called.
+
+    The event loop runs in its own thread for the rest of the script and has one aiohttp session,
+    so every call to get_json_async() uses the same connection pool and connections are kept open between calls,
+    instead of connecting again (including the TLS handshake) each time. The session is closed when the script ends.
+
+    Returns:
+        The event loop.
+    """
+    global async_loop, async_session
+    with setup_lock:
+        if async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+            async_session = asyncio.run_coroutine_threadsafe(make_async_session(), loop).result()
+            async_loop = loop
+            atexit.register(close_async_loop)
+    return async_loop
+
+
+def get_cache_hours(record_type, missing=False):
+    """Get how many hours data of a record type is used from the metadata cache before it is requested again.
+
+    The default is 1 hour for seeds and collections, whose metadata is edited, and no limit for crawl jobs,
+    which do not change. The optional cache_hours configuration variable can change any of these.
+
+    Ids that are not in Archive-It are rarely added back, so by default they are used for 24 hours for seeds and
+    collections and with no limit for crawl jobs. The optional missing_cache_hours configuration variable
+    can change any of these.
+
+    Parameters:
+        record_type : type of Partner API data, for example seed, collection, or crawl_job
+        missing : if the hours are for ids that are not in Archive-It (Boolean)
+
+    Returns:
+        Number of hours, or None if there is no limit.
+    """
+    if missing:
+        cache_hours = {'seed': 24, 'collection': 24, 'crawl_job': None}
+        cache_hours.update(get_setting('missing_cache_hours', {}))
+    else:
+        cache_hours = {'seed': 1, 'collection': 1, 'crawl_job': None}
+        cache_hours.update(get_setting('cache_hours', {}))
+    return cache_hours.get(record_type)
+
+
+def get_json_async(api_calls, limit):
+    """Make a list of Archive-It API calls with asyncio and return the results in the same order as the API calls.
+
+    The API calls are run in the event loop and session shared by every call to this function (see get_async_loop()),
+    and a semaphore limits how many of these API calls are waiting for a response at the same time.
+    This can be called by more than one thread at the same time.
+
+    Parameters:
+        api_calls : list of tuples with the URL and the parameters (dictionary or None) for each API call
+        limit : the most API calls to make at the same time
+
+    Returns:
+        List of tuples with the status code and API data (json) for each API call. The data is None for an API error.
+    """
+    return asyncio.run_coroutine_threadsafe(get_json_async_all(api_calls, limit), get_async_loop()).result()
+
+
+async def get_json_async_all(api_calls, limit):
+    """Make every API call for get_json_async() with the shared session.
+
+    Parameters:
+        api_calls : list of tuples with the URL and the parameters (dictionary or None) for each API call
+        limit : the most API calls to make at the same time
+
+    Returns:
+        List of tuples with the status code and API data (json) for each API call. The data is None for an API error.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    return await asyncio.gather(*[get_json_async_one(async_session, semaphore, url, params)
+                                  for url, params in api_calls])
+
+
+async def get_json_async_one(session, semaphore, url, params):
+    """Make one API call for get_json_async(), waiting for the semaphore first.
+
+    The rate limiter, concurrency controller, and temporary errors are handled the same way as api_get(),
+    without holding the semaphore while waiting to try again.
+
+    Parameters:
+        session : aiohttp session shared by all the async API calls
+        semaphore : asyncio semaphore that limits how many API calls are made at the same time
+        url : API URL
+        params : dictionary of API parameters, or None
+
+    Returns:
+        Tuple with the status code and API data (json), which is None if there was an API error.
+    """
+    # aiohttp does not accept numbers as parameter values, so they are converted to strings.
+    if params:
+        params = {key: str(value) for key, value in params.items()}
+    attempts = get_setting('retry_attempts', 5)
+    deadline = time.monotonic() + get_setting('retry_seconds', 300)
+    timeout = aiohttp.ClientTimeout(total=get_setting('http_timeout', 120))
+    rate_limiter = get_rate_limiter(url)
+    controller = concurrency_controllers.get(get_api_name(url))
+    for attempt in range(1, attempts + 1):
+        async with semaphore:
+            if rate_limiter:
+                await asyncio.sleep(rate_limiter.reserve())
+            if controller:
+                await controller.acquire_async()
+            started = time.monotonic()
+            status_code = None
+            try:
+                async with session.get(url, params=params, timeout=timeout) as response:
+                    status_code = response.status
+                    if response.status == 200:
+                        return response.status, await response.json(content_type=None)
+                    if response.status not in retry_status_codes:
+                        return response.status, None
+                    delay = get_retry_delay(attempt, response.status, response.headers.get('Retry-After'))
+                    if attempt == attempts or time.monotonic() + delay > deadline:
+                        return response.status, None
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = get_retry_delay(attempt)
+                if attempt == attempts or time.monotonic() + delay > deadline:
+                    raise
+            finally:
+                if controller:
+                    controller.release(status_code, time.monotonic() - started)
+        await asyncio.sleep(delay)
+
+
+def get_rate_limiter(url):
+    """Get the rate limiter for the Archive-It API of a URL, making it the first time it is needed.
+
+    The optional rate_limits configuration variable has the most API calls per second for the Partner API
+    and for WASAPI. The limit is shared by every thread and API call in the script. The rate limiter is made
+    while holding setup_lock, so threads that need it at the same time all get the same one.
+
+    Parameter:
+        url : API URL
+
+    Returns:
+        The TokenBucket for the API, or None if the URL is not for either API or that API has no limit.
+    """
+    api = get_api_name(url)
+    if api is None:
+        return None
+    rate = get_setting('rate_limits', {}).get(api)
+    if rate is None:
+        return None
+    with setup_lock:
+        if api not in rate_limiters:
+            rate_limiters[api] = TokenBucket(rate)
+        return rate_limiters[api]
+
+
+def get_retry_delay(attempt, status_code=None, retry_after=None):
+    """Calculate how many seconds to wait before trying an API call again.
+
+    For 429 (too many requests) and 503 (unavailable) responses with a Retry-After header,
+    this is the time the API asked for. Otherwise, it is a random time between 0 and a limit that doubles
+    with each attempt (1, 2, 4... seconds, up to 60), so API calls that failed together do not all try again together.
+
+    Parameters:
+        attempt : the number of the attempt that failed, starting with 1
+        status_code : status code of the response, or None if there was no response
+        retry_after : value of the Retry-After header of the response, or None if it was not included
+
+    Returns:
+        Number of seconds to wait.
+    """
+    # Retry-After is either a number of seconds or an HTTP date.
+    if status_code in (429, 503) and retry_after:
+        if retry_after.strip().isdigit():
+            return int(retry_after)
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(60, 2 ** (attempt - 1)))
+
+
+def get_session():
+    """Get the requests session shared by every API call, making it the first time this is called.
+
+    The session keeps connections open, so API calls after the first one to the same server
+    do not need to connect again. The optional http_pool_size configuration variable is the most connections
+    kept open for each server, which should be at least the number of API calls made at the same time.
+
+    Returns:
+        The requests session.
+    """
+    global session
+    with setup_lock:
+        if session is None:
+            new_session = requests.Session()
+            pool_size = get_setting('http_pool_size', 20)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            new_session.mount('https://', adapter)
+            new_session.mount('http://', adapter)
+            session = new_session
+    return session
+
+
+def get_setting(name, default):
+    """Get the value of an optional variable from the configuration file, or the default if it is not included.
+
+    Parameters:
+        name : name of the variable
+        default : value to use if the variable is not in the configuration file
+
+    Returns:
+        The value of the variable.
+    """
+    return getattr(c, name, default)
+
+
 def get_metadata_value(data, field):
     """Get and format the value of a field in the API data, which may be repeated, occur once, or not be included.
 
@@ -109,17 +619,615 @@ def get_metadata_value(data, field):
         return 'NO DATA OF THIS TYPE'
 
 
-def save_csv_row(report_path, row_list):
-    """Save a row to a CSV spreadsheet.
+async def make_async_session():
+    """Make the aiohttp session for get_async_loop(), which has to be done in the event loop it is used in.
+
+    The connection pool has no limit of its own, since each call to get_json_async() limits its API calls.
+
+    Returns:
+        The aiohttp session.
+    """
+    connector = aiohttp.TCPConnector(limit=0)
+    return aiohttp.ClientSession(connector=connector, auth=aiohttp.BasicAuth(c.username, c.password))
+
+
+def percentile(values, percent):
+    """Get a percentile of a list of numbers, using the nearest value instead of calculating between values.
 
     Parameters:
-        report_path : path to the report spreadsheet, which may or may not already exist
-        row_list : list with values for a single spreadsheet row
+        values : list (or other collection) of numbers, which must not be empty
+        percent : the percentile to get, from 0 to 100
 
     Returns:
-        Nothing
+        The number at that percentile.
+    """
+    ordered = sorted(values)
+    return ordered[round(percent / 100 * (len(ordered) - 1))]
+
+
+def read_json_stream(chunks, list_field, fields):
+    """Read a JSON object as it arrives, yielding each item of one list in it without reading the rest first.
+
+    This is for API responses with a long list, such as the WARCs in a WASAPI page,
+    so the whole response is never held in memory as text and each part of it is only parsed once.
+    Each value is parsed with the standard JSON decoder as soon as enough of the response has arrived.
+    A value that ends at the end of the text read so far, or is followed by a character that could continue a number
+    (for example 1 in 1.5 or 1e3), is only used once more text has arrived or the response is finished,
+    since it may continue in the next chunk.
+
+    Parameters:
+        chunks : iterable of the response body in pieces (bytes or text), for example response.iter_content()
+        list_field : the field in the JSON object with the list to yield one item at a time
+        fields : dictionary that the other fields in the JSON object are added to as they are read
+
+    Returns:
+        Yields each item in the list, or raises a value error if the response is not a correctly formatted JSON object.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    state = {'buffer': '', 'position': 0, 'finished': False}
+    number_characters = '0123456789.eE+-'
+
+    def read_more():
+        # Adds the next chunk to the text not parsed yet, dropping the text that was already parsed.
+        if state['finished']:
+            raise ValueError("The JSON ended before it was complete.")
+        try:
+            chunk = next(chunks)
+            text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        except StopIteration:
+            text = text_decoder.decode(b'', final=True)
+            state['finished'] = True
+        state['buffer'] = state['buffer'][state['position']:] + text
+        state['position'] = 0
+
+    def peek():
+        # Returns the next character that is not whitespace without using it, or '' if the JSON has ended.
+        while True:
+            buffer = state['buffer']
+            while state['position'] < len(buffer) and buffer[state['position']] in ' \t\r\n':
+                state['position'] += 1
+            if state['position'] < len(buffer):
+                return buffer[state['position']]
+            if state['finished']:
+                return ''
+            read_more()
+
+    def read_character(expected):
+        # Uses the next character that is not whitespace, which must be one of the expected characters.
+        character = peek()
+        if character == '' or character not in expected:
+            raise ValueError(f"Expected one of {expected} in the JSON.")
+        state['position'] += 1
+        return character
+
+    def read_value():
+        peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(state['buffer'], state['position'])
+                if state['finished'] or (end < len(state['buffer']) and state['buffer'][end] not in number_characters):
+                    state['position'] = end
+                    return value
+            except json.JSONDecodeError:
+                if state['finished']:
+                    raise
+            read_more()
+
+    read_character('{')
+    if peek() == '}':
+        return
+    while True:
+        key = read_value()
+        read_character(':')
+        if key == list_field:
+            read_character('[')
+            if peek() == ']':
+                state['position'] += 1
+            else:
+                while True:
+                    yield read_value()
+                    if read_character(',]') == ']':
+                        break
+        else:
+            fields[key] = read_value()
+        if read_character(',}') == '}':
+            return
+
+
+def run_pipeline(source, stages, queue_size=2):
+    """Run each stage of a pipeline in its own threads, joined by queues, and yield the results of the last stage.
+
+    The source (for example, a generator that gets pages from an API) is read in one thread,
+    and each stage is a function that gets one item from the stage before it and returns one item for the next stage,
+    or None to skip that item. All the stages work at the same time on different items,
+    and each queue holds at most queue_size items, so a stage that is ahead waits for the one after it
+    instead of keeping everything in memory.
+
+    A stage can be a tuple of the function and the number of workers (threads) to run it with, so that several
+    items are worked on at the same time. Items can finish out of order, so each stage puts its results
+    in a ReorderBuffer that passes them on in the order of the source. The buffer holds at most twice the workers,
+    so workers wait for a slow item instead of getting too far ahead of it.
+
+    Parameters:
+        source : iterable of items for the first stage
+        stages : list of functions or (function, workers) tuples, in the order they are run
+        queue_size : the most items waiting between two stages
+
+    Returns:
+        Yields the result of the last stage for each item, or raises the first error from the source or a stage.
+    """
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+
+    # Markers passed through the queues, after the last item and in place of a skipped item.
+    done = object()
+    skip = object()
+
+    def put(item_queue, item):
+        # Checks regularly if the pipeline was stopped, so a thread does not wait forever on a full queue.
+        while not stop.is_set():
+            try:
+                item_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read_source():
+        # Numbers the items so they can be put back in order after a stage with more than one worker.
+        number = 0
+        try:
+            for item in source:
+                if stop.is_set():
+                    return
+                put(queues[0], (number, item))
+                number += 1
+            put(queues[0], (number, done))
+        except BaseException as error:
+            put(queues[0], (number, PipelineError(error)))
+
+    def run_worker(function, in_queue, buffer):
+        while not stop.is_set():
+            try:
+                number, item = in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # The end of the items (or an error) is put back for the other workers and passed on, in order.
+            if item is done or isinstance(item, PipelineError):
+                buffer.put(number, item)
+                put(in_queue, (number, item))
+                return
+            if item is skip:
+                buffer.put(number, skip)
+                continue
+            try:
+                result = function(item)
+            except BaseException as error:
+                buffer.put(number, PipelineError(error))
+                return
+            buffer.put(number, skip if result is None else result)
+
+    def pass_on(buffer, out_queue):
+        number = 0
+        while not stop.is_set():
+            item = buffer.get(number)
+            if item is None:
+                continue
+            put(out_queue, (number, item))
+            number += 1
+            if item is done or isinstance(item, PipelineError):
+                return
+
+    threads = [threading.Thread(target=read_source, daemon=True)]
+    for stage_number, stage in enumerate(stages):
+        function, workers = stage if isinstance(stage, tuple) else (stage, 1)
+        buffer = ReorderBuffer(2 * workers, stop)
+        for _ in range(workers):
+            threads.append(threading.Thread(target=run_worker, args=(function, queues[stage_number], buffer),
+                                            daemon=True))
+        threads.append(threading.Thread(target=pass_on, args=(buffer, queues[stage_number + 1]), daemon=True))
+    for thread in threads:
+        thread.start()
+
+    # Stops every thread once the last result is yielded, there is an error,
+    # or the code using the results stops early.
+    try:
+        while True:
+            number, item = queues[-1].get()
+            if item is done:
+                return
+            if isinstance(item, PipelineError):
+                raise item.error
+            if item is not skip:
+                yield item
+    finally:
+        stop.set()
+
+
+def single_flight(function):
+    """Decorator so calls to a function with the same arguments at the same time share one call (single-flight).
+
+    The first thread to call the function with a set of arguments runs it, and any other thread that calls it
+    with the same arguments before it finishes waits for and gets the same result (or error), instead of
+    making the same API call again. Once the call finishes, the next call with those arguments runs the function again,
+    so this does not cache results.
+
+    Parameter:
+        function : the function to share calls to, which must have arguments that can be dictionary keys
+
+    Returns:
+        The function with the calls shared.
+    """
+    in_flight = {}
+    lock = threading.Lock()
+
+    @functools.wraps(function)
+    def shared_call(*args):
+        with lock:
+            future = in_flight.get(args)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                in_flight[args] = future
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(function(*args))
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with lock:
+                del in_flight[args]
+        return future.result()
+
+    return shared_call
+
+
+class ConcurrencyController:
+    """Adjust how many API calls are made at the same time to get the most API calls done without overloading the API.
+
+    This uses additive increase, multiplicative decrease (AIMD): the limit grows by about one API call
+    each time a full limit of API calls is successful, and is cut in half when an API call has
+    a 429 or 5xx status code, has no response, or the 95th percentile of the last 20 response times is more than double
+    that of the 200 response times before them. The limit is cut at most once per response time,
+    so a burst of errors from API calls made before the cut only counts once.
+
+    It is used by api_get() and get_json_async_one() for every API call to an API once it is added to
+    concurrency_controllers, for example concurrency_controllers['partner_api'] = ConcurrencyController(20).
+    The limit is shared by every thread and the event loop, so it is the most API calls at the same time in the script.
+    If minimum, maximum, and start are the same, the limit never changes.
+
+    Parameters:
+        maximum : the most API calls to allow at the same time, which should not be more than the number of workers
+        minimum : the fewest API calls to allow at the same time
+        start : the number of API calls to allow at the same time at first, which defaults to 4 (or maximum if less)
+    """
+
+    def __init__(self, maximum, minimum=1, start=None):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(start if start is not None else min(4, maximum))
+        self.in_flight = 0
+        self.recent = deque(maxlen=20)
+        self.history = deque(maxlen=200)
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Wait until another API call is allowed, for threads."""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        """Wait until another API call is allowed, for asyncio, checking again every 10 milliseconds."""
+        while not self.try_acquire():
+            await asyncio.sleep(0.01)
+
+    def release(self, status_code, seconds):
+        """Record the result of a finished API call and adjust the limit.
+
+        Parameters:
+            status_code : status code of the response, or None if there was no response
+            seconds : how long the API call took
+        """
+        with self.condition:
+            self.in_flight -= 1
+            overloaded = status_code is None or status_code == 429 or status_code >= 500
+            if not overloaded:
+                if len(self.recent) == self.recent.maxlen:
+                    self.history.append(self.recent[0])
+                self.recent.append(seconds)
+                if len(self.recent) == self.recent.maxlen and len(self.history) > 0:
+                    overloaded = percentile(self.recent, 95) > 2 * percentile(self.history, 95)
+            now = time.monotonic()
+            if overloaded and now - self.last_decrease > seconds:
+                self.limit = max(self.minimum, self.limit / 2)
+                self.last_decrease = now
+                self.recent.clear()
+            elif not overloaded:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def try_acquire(self):
+        """Allow another API call and return True if it is under the limit, or return False without waiting."""
+        with self.condition:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+
+class InFlightIds:
+    """Keep track of the ids being requested from an API, so threads that need the same ids at the same time
+    request each id once, like single_flight() but for lists of ids, such as batches requested with id__in.
+
+    A thread claims the ids it needs in a with statement and only requests the ids it claimed.
+    When the with statement ends, the claimed ids are finished and the thread waits for the ids that other threads
+    claimed, which are in the cache once the wait is over unless there was an API error. Since the claimed ids
+    are finished before waiting, threads never wait on each other in a circle. Another thread may finish an id after
+    it was checked in the cache and before it was claimed, so check the cache again for the claimed ids.
+
+    For example:
+        with in_flight_seeds.claim(new_seeds) as claimed_seeds:
+            api_seeds = [seed for seed in claimed_seeds if seed not in cache['seeds']]
     """
-    # Append will create the report if it doesn't already exist or add to the end of the report if it is present.
-    with open(report_path, 'a', newline='') as output:
-        write = csv.writer(output)
-        write.writerow(row_list)
+
+    def __init__(self):
+        self.events = {}
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def claim(self, ids):
+        """Claim the ids that no other thread is requesting, for a with statement.
+
+        The claimed ids are finished when the with statement ends, even if there is an error,
+        and then the thread waits for the ids requested by other threads, unless there was an error.
+
+        Parameter:
+            ids : list of ids, without duplicates
+
+        Returns:
+            List of the ids claimed by this thread, which it should request.
+        """
+        claimed = []
+        events = []
+        with self.lock:
+            for record_id in ids:
+                if record_id in self.events:
+                    events.append(self.events[record_id])
+                else:
+                    self.events[record_id] = threading.Event()
+                    claimed.append(record_id)
+        try:
+            yield claimed
+        finally:
+            with self.lock:
+                for record_id in claimed:
+                    self.events.pop(record_id).set()
+        for event in events:
+            event.wait()
+
+
+class PipelineError:
+    """Hold an error from a thread in run_pipeline() so it can be passed through the queues and raised at the end.
+
+    Parameter:
+        error : the error (exception) raised in the thread
+    """
+
+    def __init__(self, error):
+        self.error = error
+
+
+class ReorderBuffer:
+    """Hold items that finished out of order until the items before them have been passed on, for run_pipeline().
+
+    Items are numbered in the order they need to be passed on. There is room for the next capacity items after the
+    last one passed on, and a worker with an item after that waits until there is room, which slows down
+    the workers that are ahead (backpressure) so the buffer does not grow without limit.
+
+    Parameters:
+        capacity : the most items to hold, which must be at least the number of workers adding items
+        stop : threading event that is set if the pipeline stops, so waiting threads stop too
+    """
+
+    def __init__(self, capacity, stop):
+        self.capacity = capacity
+        self.stop = stop
+        self.items = {}
+        self.next_number = 0
+        self.condition = threading.Condition()
+
+    def get(self, number):
+        """Wait for the item with this number, which must be the next one, and remove it from the buffer.
+
+        Returns None if it is not ready after 0.1 seconds, so the caller can check if the pipeline has stopped.
+        """
+        with self.condition:
+            if number not in self.items:
+                self.condition.wait(timeout=0.1)
+                if number not in self.items:
+                    return None
+            self.next_number = number + 1
+            self.condition.notify_all()
+            return self.items.pop(number)
+
+    def put(self, number, item):
+        """Add an item to the buffer, waiting until it is within capacity of the next item to be passed on."""
+        with self.condition:
+            while number >= self.next_number + self.capacity and not self.stop.is_set():
+                self.condition.wait(timeout=0.1)
+            self.items[number] = item
+            self.condition.notify_all()
+
+
+class ReportWriter:
+    """Save rows to a CSV report, keeping the report open while the script runs and saving rows in batches.
+
+    Rows are kept in memory until there are buffer_rows of them or flush_seconds have passed since rows were
+    last saved, which is much faster than opening the report to save each row, especially on network drives.
+
+    The rows are saved to a temporary file next to the report, which is only renamed to the report path by close(),
+    so an incomplete report is never at the report path and running the script again replaces the report.
+    Use it with a with statement, which calls close() if there are no errors and discard() if there are,
+    or call one of them when done.
+
+    Parameters:
+        report_path : path to the report spreadsheet, which is replaced if it already exists
+        buffer_rows : the most rows to keep in memory before saving them
+        flush_seconds : the most seconds to keep rows in memory before saving them
+    """
+
+    def __init__(self, report_path, buffer_rows=1000, flush_seconds=5):
+        self.report_path = report_path
+        self.temp_path = f'{report_path}.tmp'
+        self.report = open(self.temp_path, 'w', newline='', buffering=1024 * 1024)
+        self.writer = csv.writer(self.report)
+        self.buffer_rows = buffer_rows
+        self.flush_seconds = flush_seconds
+        self.rows = []
+        self.last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def close(self):
+        """Save any rows still in memory, close the temporary file, and rename it to the report path."""
+        self.flush()
+        self.report.close()
+        os.replace(self.temp_path, self.report_path)
+
+    def discard(self):
+        """Close and delete the temporary file without making the report, for when the script cannot finish."""
+        self.report.close()
+        os.remove(self.temp_path)
+
+    def flush(self):
+        """Save the rows in memory to the temporary file."""
+        self.writer.writerows(self.rows)
+        self.report.flush()
+        self.rows = []
+        self.last_flush = time.monotonic()
+
+    def writerow(self, row_list):
+        """Add one row, a list of values, to the report."""
+        self.writerows([row_list])
+
+    def writerows(self, rows):
+        """Add a list of rows to the report, saving them if the size or time limit has been reached."""
+        self.rows.extend(rows)
+        if len(self.rows) >= self.buffer_rows or time.monotonic() - self.last_flush >= self.flush_seconds:
+            self.flush()
+
+
+class RequestHedger:
+    """Send a duplicate of an API call that is taking much longer than usual, and use whichever response arrives first.
+
+    A few very slow responses can take up most of the time the script spends on API calls.
+    The delay before sending a duplicate is a percentile of the recent response times, so only the slowest API calls
+    (for the 95th percentile, about 5%) are duplicated. No duplicates are sent until there are min_samples response
+    times, and duplicates are never more than max_extra of the API calls made, so the API has at most that much
+    extra load. The slower API call is not stopped, but its response is not used.
+
+    Parameters:
+        percentile : the percentile of recent response times to wait before sending a duplicate
+        max_extra : the most duplicates to send, as a fraction of the API calls made
+        min_samples : the fewest response times needed before sending duplicates
+    """
+
+    def __init__(self, percentile=95, max_extra=0.05, min_samples=20):
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=200)
+        self.calls = 0
+        self.hedges = 0
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=2 * get_setting('http_pool_size', 20))
+
+    def call(self, url, params):
+        """Make one API call in the pool, saving how long it took when it finishes."""
+        started = time.monotonic()
+        future = self.pool.submit(api_get, url, params)
+        future.add_done_callback(lambda done: self.save_latency(time.monotonic() - started))
+        return future
+
+    def get(self, url, params=None):
+        """Make an API call with api_get(), sending a duplicate if there is no response after the delay.
+
+        Parameters:
+            url : API URL
+            params : dictionary of API parameters, or None
+
+        Returns:
+            The API response that arrived first, or raises the error if neither API call got a response.
+        """
+        with self.lock:
+            self.calls += 1
+            delay = None
+            if len(self.latencies) >= self.min_samples:
+                delay = percentile(self.latencies, self.percentile)
+
+        futures = [self.call(url, params)]
+        if delay is not None and len(wait(futures, timeout=delay).done) == 0:
+            with self.lock:
+                can_hedge = self.hedges + 1 <= self.max_extra * self.calls
+                if can_hedge:
+                    self.hedges += 1
+            if can_hedge:
+                futures.append(self.call(url, params))
+
+        error = None
+        for future in as_completed(futures):
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+        raise error
+
+    def save_latency(self, seconds):
+        """Add how long an API call took to the recent response times."""
+        with self.lock:
+            self.latencies.append(seconds)
+
+
+class TokenBucket:
+    """Limit how many API calls are made per second, shared by every thread and asyncio task.
+
+    The bucket fills with tokens at the rate, up to the capacity, and each API call uses one token.
+    If there are no tokens left, the API call waits until its token will be added.
+    So API calls can be made right away in short bursts of up to capacity, but never faster than the rate over time.
+
+    Parameters:
+        rate : the most API calls per second
+        capacity : the most tokens the bucket can hold, which defaults to one second of API calls (at least 1)
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.last_update = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Use a token for an API call and return how many seconds to wait before making it.
+
+        The token is used right away, even if the bucket is empty, so each waiting API call has its own turn.
+        The caller does the waiting, with time.sleep() or asyncio.sleep(), so the lock is not held while waiting.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_update) * self.rate)
+            self.last_update = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
@@ -0,0 +1,71 @@
+"""
+Tests for the api_get() and get_session() shared functions.
+They make API calls with one shared requests session, with or without the Archive-It credentials,
+and try again if there is a temporary API error.
+"""
+import unittest
+from unittest import mock
+import requests
+import configuration as c
+import shared_functions
+from shared_functions import api_get, get_session
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_auth(self):
+        """
+        Tests that the function can access the Partner API, which requires the credentials.
+        """
+        actual = api_get(f"{c.partner_api}/seed", params={'limit': 1}).status_code
+        expected = 200
+        self.assertEqual(actual, expected, "Problem with test for auth")
+
+    def test_no_auth(self):
+        """
+        Tests that the function can access the institution page without the credentials.
+        """
+        actual = api_get(c.inst_page, auth=False).status_code
+        expected = 200
+        self.assertEqual(actual, expected, "Problem with test for no auth")
+
+    def test_retry(self):
+        """
+        Tests that the function tries again after a temporary error and returns the first successful response.
+        Uses a mock session so the errors happen every time.
+        """
+        throttled = mock.Mock(status_code=429, headers={'Retry-After': '0'})
+        success = mock.Mock(status_code=200, headers={})
+        responses = [requests.exceptions.ConnectionError(), throttled, success]
+        with mock.patch.object(shared_functions, 'get_session') as mock_session, \
+                mock.patch.object(shared_functions, 'get_retry_delay', return_value=0):
+            mock_session.return_value.get.side_effect = responses
+            response = api_get(c.inst_page, auth=False)
+        actual = (response.status_code, mock_session.return_value.get.call_count)
+        expected = (200, 3)
+        self.assertEqual(actual, expected, "Problem with test for retry")
+
+    def test_retry_limit(self):
+        """
+        Tests that the function returns the error response once the most attempts have been made.
+        """
+        throttled = mock.Mock(status_code=503, headers={})
+        with mock.patch.object(shared_functions, 'get_session') as mock_session, \
+                mock.patch.object(shared_functions, 'get_retry_delay', return_value=0), \
+                mock.patch.object(c, 'retry_attempts', 3, create=True):
+            mock_session.return_value.get.return_value = throttled
+            response = api_get(c.inst_page, auth=False)
+        actual = (response.status_code, mock_session.return_value.get.call_count)
+        expected = (503, 3)
+        self.assertEqual(actual, expected, "Problem with test for retry limit")
+
+    def test_shared_session(self):
+        """
+        Tests that the same session is used for every API call.
+        """
+        api_get(c.inst_page, auth=False)
+        self.assertIs(get_session(), get_session(), "Problem with test for shared session")
+
+
+if __name__ == '__main__':
+    unittest.main()
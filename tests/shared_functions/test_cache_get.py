@@ -0,0 +1,98 @@
+"""
+Tests for the cache_connect(), cache_save(), cache_get(), cache_save_count() and cache_count() shared functions.
+They save Partner API data and the number of ids in the account to the metadata cache and get them back.
+"""
+import os
+import time
+import unittest
+from unittest.mock import patch
+import configuration as c
+from shared_functions import cache_connect, cache_count, cache_get, cache_save, cache_save_count
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a metadata cache in the script_output folder for testing.
+        """
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            self.connection = cache_connect()
+
+    def tearDown(self):
+        """
+        Deletes the test metadata cache.
+        """
+        self.connection.close()
+        os.remove(os.path.join(c.script_output, "metadata_cache.sqlite"))
+
+    def test_count(self):
+        """
+        Tests that the function returns the newest saved number of any age for the record type,
+        and None if no number was saved, even if there is data for the record type, or there is no metadata cache.
+        """
+        cache_save_count(self.connection, "seed", 5)
+        cache_save_count(self.connection, "seed", 3)
+        self.connection.execute("UPDATE counts SET fetched = ?", [time.time() - 7200])
+        cache_save(self.connection, "crawl_job", {"1": {"id": 1}})
+        actual = (cache_count(self.connection, "seed"), cache_count(self.connection, "crawl_job"),
+                  cache_count(None, "seed"))
+        expected = (3, None, None)
+        self.assertEqual(actual, expected, "Problem with test for count")
+
+    def test_expired(self):
+        """
+        Tests that the function does not return seed data saved longer ago than the default of 1 hour,
+        but does return crawl job data of the same age, since crawl jobs have no limit by default.
+        """
+        cache_save(self.connection, "seed", {"1": {"id": 1}})
+        cache_save(self.connection, "crawl_job", {"2": {"id": 2}})
+        self.connection.execute("UPDATE records SET fetched = ?", [time.time() - 7200])
+        actual = (cache_get(self.connection, "seed", ["1"]), cache_get(self.connection, "crawl_job", [2]))
+        expected = ({}, {"2": {"id": 2}})
+        self.assertEqual(actual, expected, "Problem with test for expired")
+
+    def test_missing(self):
+        """
+        Tests that the function returns None for a seed that is not in Archive-It for longer than the data is used
+        (24 hours by default instead of 1), and that the newest result is used if a seed is found again.
+        """
+        cache_save(self.connection, "seed", {"1": None, "2": None})
+        self.connection.execute("UPDATE missing SET fetched = ?", [time.time() - 7200])
+        cache_save(self.connection, "seed", {"2": {"id": 2}})
+        actual = cache_get(self.connection, "seed", ["1", "2"])
+        expected = {"1": None, "2": {"id": 2}}
+        self.assertEqual(actual, expected, "Problem with test for missing")
+
+    def test_missing_expired(self):
+        """
+        Tests that the function does not return a seed that is not in Archive-It once missing_cache_hours have passed.
+        """
+        cache_save(self.connection, "seed", {"1": None})
+        self.connection.execute("UPDATE missing SET fetched = ?", [time.time() - 7200])
+        with patch.object(c, 'missing_cache_hours', {'seed': 1}, create=True):
+            actual = cache_get(self.connection, "seed", ["1"])
+        self.assertEqual(actual, {}, "Problem with test for missing expired")
+
+    def test_no_cache(self):
+        """
+        Tests that the functions do nothing when there is no metadata cache.
+        """
+        cache_save(None, "seed", {"1": {"id": 1}})
+        actual = cache_get(None, "seed", ["1"])
+        self.assertEqual(actual, {}, "Problem with test for no cache")
+
+    def test_saved(self):
+        """
+        Tests that the function returns the saved data, including None for an id not in Archive-It,
+        and only for the requested record type and ids.
+        """
+        cache_save(self.connection, "seed", {"1": {"id": 1, "url": "one"}, "2": {"id": 2, "url": "two"}})
+        cache_save(self.connection, "crawl_job", {"1": None})
+        actual = (cache_get(self.connection, "seed", ["1", "3"]), cache_get(self.connection, "crawl_job", ["1"]))
+        expected = ({"1": {"id": 1, "url": "one"}}, {"1": None})
+        self.assertEqual(actual, expected, "Problem with test for saved")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Tests for the ConcurrencyController shared class.
+It adjusts how many API calls are allowed at the same time based on the results of finished API calls.
+"""
+import unittest
+from shared_functions import ConcurrencyController
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_decrease_error(self):
+        """
+        Tests that the limit is cut in half when an API call has a 429 status code,
+        and only once for a burst of errors from API calls that were already made.
+        """
+        controller = ConcurrencyController(20, start=8)
+        for call in range(3):
+            controller.try_acquire()
+        controller.release(429, 1.0)
+        controller.release(503, 1.0)
+        controller.release(None, 1.0)
+        actual = controller.limit
+        expected = 4
+        self.assertEqual(actual, expected, "Problem with test for decrease: error")
+
+    def test_decrease_latency(self):
+        """
+        Tests that the limit is cut in half when recent response times are much slower than before.
+        """
+        controller = ConcurrencyController(20, start=20)
+        for seconds in [0.1] * 100 + [0.5] * 2:
+            controller.try_acquire()
+            controller.release(200, seconds)
+        actual = controller.limit
+        expected = 10
+        self.assertEqual(actual, expected, "Problem with test for decrease: latency")
+
+    def test_fixed(self):
+        """
+        Tests that the limit does not change when the minimum, maximum, and start are the same.
+        """
+        controller = ConcurrencyController(4, 4, 4)
+        for status_code in [200] * 30 + [429, 503, None]:
+            controller.try_acquire()
+            controller.release(status_code, 0.1)
+        actual = (controller.limit, [controller.try_acquire() for call in range(5)])
+        expected = (4, [True, True, True, True, False])
+        self.assertEqual(actual, expected, "Problem with test for fixed")
+
+    def test_increase(self):
+        """
+        Tests that the limit goes up by about one for each full limit of successful API calls, up to the maximum.
+        """
+        controller = ConcurrencyController(6, start=2)
+        limits = []
+        for call in range(20):
+            controller.try_acquire()
+            controller.release(200, 0.1)
+            limits.append(int(controller.limit))
+        actual = (limits[1], limits[4], limits[-1])
+        expected = (2, 3, 6)
+        self.assertEqual(actual, expected, "Problem with test for increase")
+
+    def test_try_acquire(self):
+        """
+        Tests that no more API calls are allowed than the limit.
+        """
+        controller = ConcurrencyController(20, start=2)
+        actual = [controller.try_acquire() for call in range(3)]
+        expected = [True, True, False]
+        self.assertEqual(actual, expected, "Problem with test for try acquire")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Tests for the get_api_name() shared function.
+It returns which Archive-It API a URL is for.
+"""
+import unittest
+from unittest import mock
+import configuration as c
+from shared_functions import get_api_name
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_apis(self):
+        """
+        Tests that the function returns the API for Partner API and WASAPI URLs and None for other URLs.
+        """
+        actual = [get_api_name(f"{c.partner_api}/seed"), get_api_name(c.wasapi), get_api_name(c.inst_page)]
+        expected = ['partner_api', 'wasapi', None]
+        self.assertEqual(actual, expected, "Problem with test for apis")
+
+    def test_missing_config(self):
+        """
+        Tests that the function skips an API that is missing from the configuration file instead of raising an error.
+        """
+        url = c.inst_page
+        with mock.patch.dict(c.__dict__):
+            del c.partner_api
+            del c.wasapi
+            actual = get_api_name(url)
+        expected = None
+        self.assertEqual(actual, expected, "Problem with test for missing config")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+"""
+Tests for the get_async_loop() shared function.
+It returns the event loop shared by every async API call, starting it and its aiohttp session the first time.
+"""
+import unittest
+import shared_functions
+from shared_functions import get_async_loop
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_shared(self):
+        """
+        Tests that the function returns the same running event loop and makes one session each time it is called.
+        """
+        first_loop = get_async_loop()
+        first_session = shared_functions.async_session
+        second_loop = get_async_loop()
+        actual = (first_loop is second_loop, first_loop.is_running(), first_session is shared_functions.async_session)
+        expected = (True, True, True)
+        self.assertEqual(actual, expected, "Problem with test for shared")
+
+
+if __name__ == '__main__':
+    unittest.main()
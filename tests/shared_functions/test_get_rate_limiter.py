@@ -0,0 +1,64 @@
+"""
+Tests for the get_rate_limiter() shared function.
+It returns the rate limiter for the Archive-It API of a URL, if the configuration file has a limit for that API.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import time
+import unittest
+from unittest import mock
+import configuration as c
+import shared_functions
+from shared_functions import get_rate_limiter
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Removes rate limiters made by other tests, since they are kept for the rest of the script.
+        """
+        shared_functions.rate_limiters.clear()
+
+    def test_no_limit(self):
+        """
+        Tests that the function returns None when there is no limit for the API or the URL is not for either API.
+        """
+        with mock.patch.object(c, 'rate_limits', {'partner_api': 5}, create=True):
+            actual = [get_rate_limiter(c.wasapi), get_rate_limiter(c.inst_page)]
+        expected = [None, None]
+        self.assertEqual(actual, expected, "Problem with test for no limit")
+
+    def test_shared(self):
+        """
+        Tests that every URL for the same API gets the same rate limiter, which has the configured rate.
+        """
+        with mock.patch.object(c, 'rate_limits', {'partner_api': 5, 'wasapi': 1}, create=True):
+            seed_limiter = get_rate_limiter(f"{c.partner_api}/seed")
+            job_limiter = get_rate_limiter(f"{c.partner_api}/crawl_job")
+            wasapi_limiter = get_rate_limiter(c.wasapi)
+        actual = [seed_limiter is job_limiter, seed_limiter.rate, wasapi_limiter.rate]
+        expected = [True, 5, 1]
+        self.assertEqual(actual, expected, "Problem with test for shared")
+
+    def test_threads(self):
+        """
+        Tests that threads that need the rate limiter at the same time all get the same one, and only one is made.
+        Makes the rate limiter slow to make, so the threads are all waiting for it at once.
+        """
+        token_bucket = shared_functions.TokenBucket
+
+        def slow_bucket(rate):
+            time.sleep(0.1)
+            return token_bucket(rate)
+
+        with mock.patch.object(c, 'rate_limits', {'wasapi': 1}, create=True), \
+                mock.patch.object(shared_functions, 'TokenBucket', side_effect=slow_bucket) as mock_bucket:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                limiters = list(pool.map(get_rate_limiter, [c.wasapi] * 8))
+        actual = (len({id(limiter) for limiter in limiters}), mock_bucket.call_count)
+        expected = (1, 1)
+        self.assertEqual(actual, expected, "Problem with test for threads")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for the get_retry_delay() shared function.
+It calculates how many seconds to wait before trying an API call again.
+"""
+from email.utils import formatdate
+import time
+import unittest
+from shared_functions import get_retry_delay
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_backoff(self):
+        """
+        Tests that the delay is between 0 and the limit for each attempt, which doubles up to 60 seconds.
+        """
+        actual = [0 <= get_retry_delay(attempt) <= limit for attempt, limit in ((1, 1), (3, 4), (10, 60))]
+        expected = [True, True, True]
+        self.assertEqual(actual, expected, "Problem with test for backoff")
+
+    def test_retry_after_date(self):
+        """
+        Tests that the delay is the time until the date in the Retry-After header of a 503 response.
+        """
+        retry_after = formatdate(time.time() + 30, usegmt=True)
+        actual = 25 < get_retry_delay(1, 503, retry_after) <= 30
+        self.assertEqual(actual, True, "Problem with test for Retry-After date")
+
+    def test_retry_after_ignored(self):
+        """
+        Tests that the Retry-After header is not used for a status code other than 429 or 503.
+        """
+        actual = get_retry_delay(1, 500, '120') <= 1
+        self.assertEqual(actual, True, "Problem with test for Retry-After ignored")
+
+    def test_retry_after_invalid(self):
+        """
+        Tests that the delay is calculated from the attempt if the Retry-After header is not formatted correctly.
+        """
+        actual = get_retry_delay(1, 429, 'soon') <= 1
+        self.assertEqual(actual, True, "Problem with test for Retry-After invalid")
+
+    def test_retry_after_seconds(self):
+        """
+        Tests that the delay is the number of seconds in the Retry-After header of a 429 response.
+        """
+        actual = get_retry_delay(1, 429, '120')
+        expected = 120
+        self.assertEqual(actual, expected, "Problem with test for Retry-After seconds")
+
+
+if __name__ == '__main__':
+    unittest.main()
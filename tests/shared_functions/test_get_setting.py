@@ -0,0 +1,29 @@
+"""
+Tests for the get_setting() shared function.
+It returns the value of an optional configuration variable, or the default if the variable is not included.
+"""
+import unittest
+from shared_functions import get_setting
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_included(self):
+        """
+        Tests that the function returns the value of a variable that is in the configuration file.
+        """
+        actual = get_setting("partner_api", "default")
+        expected = "https://partner.archive-it.org/api"
+        self.assertEqual(actual, expected, "Problem with test for included")
+
+    def test_not_included(self):
+        """
+        Tests that the function returns the default for a variable that is not in the configuration file.
+        """
+        actual = get_setting("not_a_variable", "default")
+        expected = "default"
+        self.assertEqual(actual, expected, "Problem with test for not included")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Tests for the InFlightIds shared class.
+It keeps track of the ids being requested from an API, so threads that need the same ids at the same time
+request each id once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+from shared_functions import InFlightIds
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_error(self):
+        """
+        Tests that the claimed ids are finished if there is an error, so they can be claimed again.
+        """
+        in_flight = InFlightIds()
+        with self.assertRaises(ValueError):
+            with in_flight.claim(["1", "2"]):
+                raise ValueError("API error")
+        with in_flight.claim(["1", "2"]) as claimed:
+            actual = claimed
+        expected = ["1", "2"]
+        self.assertEqual(actual, expected, "Problem with test for error")
+
+    def test_finished(self):
+        """
+        Tests that ids can be claimed again once the thread that claimed them has finished.
+        """
+        in_flight = InFlightIds()
+        with in_flight.claim(["1"]) as first:
+            pass
+        with in_flight.claim(["1"]) as second:
+            pass
+        actual = (first, second)
+        expected = (["1"], ["1"])
+        self.assertEqual(actual, expected, "Problem with test for finished")
+
+    def test_shared(self):
+        """
+        Tests that ids claimed by another thread are not claimed again,
+        and that the thread waits until the other thread has added them to the cache.
+        """
+        in_flight = InFlightIds()
+        cache = {}
+        started = threading.Event()
+
+        def lookup(ids):
+            with in_flight.claim(ids) as claimed:
+                started.set()
+                time.sleep(0.2)
+                for record_id in claimed:
+                    cache[record_id] = f"id {record_id}"
+            return claimed, [cache.get(record_id) for record_id in ids]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(lookup, ["1", "2"])
+            started.wait()
+            second = pool.submit(lookup, ["2", "3"])
+            actual = [first.result(), second.result()]
+        expected = [(["1", "2"], ["id 1", "id 2"]), (["3"], ["id 2", "id 3"])]
+        self.assertEqual(actual, expected, "Problem with test for shared")
+
+
+if __name__ == '__main__':
+    unittest.main()
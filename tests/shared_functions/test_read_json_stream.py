@@ -0,0 +1,74 @@
+"""
+Tests for the read_json_stream() shared function.
+It reads a JSON object as it arrives in chunks, yielding each item of one list in it.
+"""
+import json
+import unittest
+from shared_functions import read_json_stream
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Variable with JSON formatted like a WASAPI page, with a non-ASCII character and fields after the list.
+        """
+        self.data = {'count': 1234, 'files': [{'filename': 'one.warc.gz', 'size': 100, 'gb': 1.25e-07},
+                                              {'filename': 'twö.warc.gz', 'size': 20000, 'gb': 2.5e-05}],
+                     'next': None, 'previous': 'http://warcs.archive-it.org/wasapi/v1/webdata?page=1'}
+        self.json = json.dumps(self.data, ensure_ascii=False, indent=1).encode('utf-8')
+
+    def read(self, chunks):
+        """
+        Returns the items and the other fields read by the function.
+        """
+        fields = {}
+        items = list(read_json_stream(chunks, 'files', fields))
+        return items, fields
+
+    def test_chunk_sizes(self):
+        """
+        Tests that the function reads the same data no matter where the chunks are split,
+        including in the middle of a number or a character that is more than one byte.
+        """
+        expected = (self.data['files'], {key: value for key, value in self.data.items() if key != 'files'})
+        for size in range(1, 40):
+            chunks = [self.json[start:start + size] for start in range(0, len(self.json), size)]
+            self.assertEqual(self.read(chunks), expected, f"Problem with test for chunk size {size}")
+
+    def test_decimal_exponent(self):
+        """
+        Tests that the function reads numbers with a decimal or an exponent, at the top level and in the list,
+        when the chunks are split right after the decimal point or the e.
+        """
+        chunks_list = [[b'{"files": [1.', b'5]}'], [b'{"files": [1e', b'3]}'], [b'{"files": [1E', b'+3, 2]}'],
+                       [b'{"count": 2.', b'25, "files": []}'], [b'{"count": 1e', b'-2, "files": [-0.', b'5e', b'1]}']]
+        actual = [self.read(chunks) for chunks in chunks_list]
+        expected = [([1.5], {}), ([1000.0], {}), ([1000.0, 2], {}), ([], {'count': 2.25}), ([-5.0], {'count': 0.01})]
+        self.assertEqual(actual, expected, "Problem with test for decimal and exponent")
+
+    def test_empty_list(self):
+        """
+        Tests that the function yields nothing for an empty list and still reads the other fields.
+        """
+        actual = self.read([b'{"count": 0, "files": [ ]}'])
+        expected = ([], {'count': 0})
+        self.assertEqual(actual, expected, "Problem with test for empty list")
+
+    def test_incomplete(self):
+        """
+        Tests that the function raises a value error if the JSON ends before it is complete.
+        """
+        with self.assertRaises(ValueError):
+            self.read([self.json[:-10]])
+
+    def test_not_object(self):
+        """
+        Tests that the function raises a value error if the JSON is not an object.
+        """
+        with self.assertRaises(ValueError):
+            self.read([b'["one.warc.gz"]'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Tests for the ReorderBuffer shared class.
+It holds items that finished out of order until the items before them have been passed on.
+"""
+import threading
+import time
+import unittest
+from shared_functions import ReorderBuffer
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_backpressure(self):
+        """
+        Tests that adding an item more than capacity after the next item waits until the next item is passed on.
+        """
+        buffer = ReorderBuffer(2, threading.Event())
+        buffer.put(1, "item 1")
+        late = threading.Thread(target=buffer.put, args=(2, "item 2"))
+        late.start()
+        time.sleep(0.3)
+        waited = late.is_alive()
+        buffer.put(0, "item 0")
+        buffer.get(0)
+        late.join(timeout=1)
+        actual = (waited, late.is_alive(), buffer.get(1), buffer.get(2))
+        expected = (True, False, "item 1", "item 2")
+        self.assertEqual(actual, expected, "Problem with test for backpressure")
+
+    def test_order(self):
+        """
+        Tests that items added out of order are returned in order, and None is returned for an item not added yet.
+        """
+        buffer = ReorderBuffer(4, threading.Event())
+        buffer.put(2, "item 2")
+        buffer.put(1, "item 1")
+        not_ready = buffer.get(0)
+        buffer.put(0, "item 0")
+        actual = [not_ready, buffer.get(0), buffer.get(1), buffer.get(2)]
+        expected = [None, "item 0", "item 1", "item 2"]
+        self.assertEqual(actual, expected, "Problem with test for order")
+
+
+if __name__ == '__main__':
+    unittest.main()
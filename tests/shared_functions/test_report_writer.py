@@ -0,0 +1,124 @@
+"""
+Tests for the ReportWriter shared class.
+It saves rows to a temporary file in batches, which is renamed to the report path when it is closed.
+"""
+import csv
+from datetime import datetime
+import os
+import unittest
+from configuration import script_output
+from shared_functions import ReportWriter
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Variable with the test report path, which is used multiple times.
+        For more complete testing, it uses the path and CSV naming convention from the collection metadata report.
+        """
+        self.report_path = f"{script_output}/collection_metadata_{datetime.today().strftime('%Y-%m-%d')}.csv"
+
+    def tearDown(self):
+        """
+        Deletes the test metadata report.
+        """
+        os.remove(self.report_path)
+
+    def read_report(self, path):
+        """
+        Returns a list of the contents of the test CSV made by the class, or None if it does not exist.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, newline='') as open_file:
+            read_file = csv.reader(open_file)
+            return list(read_file)
+
+    def test_buffer_rows(self):
+        """
+        Tests that rows are only saved to the temporary file once the number of rows in memory reaches buffer_rows,
+        and that the rest are saved and the report is made when the report is closed.
+        """
+        report = ReportWriter(self.report_path, buffer_rows=2, flush_seconds=60)
+        report.writerow(["h1", "h2"])
+        before_limit = self.read_report(report.temp_path)
+        report.writerows([["data1", "data2"], ["data3", "data4"]])
+        after_limit = self.read_report(report.temp_path)
+        report.writerow(["data5", "data6"])
+        report.close()
+        actual = [before_limit, after_limit, self.read_report(self.report_path)]
+
+        expected = [[],
+                    [["h1", "h2"], ["data1", "data2"], ["data3", "data4"]],
+                    [["h1", "h2"], ["data1", "data2"], ["data3", "data4"], ["data5", "data6"]]]
+        self.assertEqual(actual, expected, "Problem with test buffer rows")
+
+    def test_discard(self):
+        """
+        Tests that the report is not made, and an existing report is not changed, when the report is discarded.
+        """
+        with ReportWriter(self.report_path) as report:
+            report.writerow(["old1", "old2"])
+        report = ReportWriter(self.report_path, flush_seconds=0)
+        report.writerow(["new1", "new2"])
+        report.discard()
+        actual = [self.read_report(self.report_path), os.path.exists(report.temp_path)]
+
+        expected = [[["old1", "old2"]], False]
+        self.assertEqual(actual, expected, "Problem with test discard")
+
+    def test_error(self):
+        """
+        Tests that the report is not made if there is an error while using the class with a with statement.
+        """
+        with self.assertRaises(ValueError):
+            with ReportWriter(self.report_path, flush_seconds=0) as report:
+                report.writerow(["data1", "data2"])
+                raise ValueError
+        actual = [os.path.exists(self.report_path), os.path.exists(report.temp_path)]
+
+        # Makes an empty report so tearDown() can delete it.
+        open(self.report_path, 'w').close()
+        self.assertEqual(actual, [False, False], "Problem with test error")
+
+    def test_flush_seconds(self):
+        """
+        Tests that a row is saved to the temporary file right away once flush_seconds have passed
+        since rows were last saved.
+        """
+        report = ReportWriter(self.report_path, buffer_rows=1000, flush_seconds=0)
+        report.writerow(["data1", "data2"])
+        actual = self.read_report(report.temp_path)
+        report.close()
+
+        expected = [["data1", "data2"]]
+        self.assertEqual(actual, expected, "Problem with test flush seconds")
+
+    def test_replace(self):
+        """
+        Tests that running the class again for the same report replaces it, instead of adding a second header.
+        """
+        for data in ("data1", "data2"):
+            with ReportWriter(self.report_path) as report:
+                report.writerow(["h1", "h2"])
+                report.writerow([data, data])
+        actual = self.read_report(self.report_path)
+
+        expected = [["h1", "h2"], ["data2", "data2"]]
+        self.assertEqual(actual, expected, "Problem with test replace")
+
+    def test_with(self):
+        """
+        Tests that every row is saved when the class is used with a with statement.
+        """
+        with ReportWriter(self.report_path) as report:
+            report.writerow(["h1", "h2"])
+            report.writerow(["data1", "data2"])
+        actual = self.read_report(self.report_path)
+
+        expected = [["h1", "h2"], ["data1", "data2"]]
+        self.assertEqual(actual, expected, "Problem with test with")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the RequestHedger shared class.
+It sends a duplicate of a slow API call and uses whichever response arrives first.
+Uses a mock api_get() so the response times are known.
+"""
+import time
+import unittest
+from unittest import mock
+import shared_functions
+from shared_functions import RequestHedger
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_hedge(self):
+        """
+        Tests that a duplicate is sent when the first API call is slower than the delay,
+        and the faster response from the duplicate is used.
+        """
+        responses = iter([(1.0, 'slow'), (0.0, 'fast')])
+
+        def mock_api_get(url, params):
+            seconds, response = next(responses)
+            time.sleep(seconds)
+            return response
+
+        hedger = RequestHedger(max_extra=1, min_samples=1)
+        hedger.latencies.append(0.05)
+        with mock.patch.object(shared_functions, 'api_get', side_effect=mock_api_get) as mock_get:
+            actual = (hedger.get('https://partner.archive-it.org/api/seed?id=1'), mock_get.call_count)
+        expected = ('fast', 2)
+        self.assertEqual(actual, expected, "Problem with test for hedge")
+
+    def test_max_extra(self):
+        """
+        Tests that no duplicate is sent once the duplicates would be more than max_extra of the API calls.
+        """
+        def mock_api_get(url, params):
+            time.sleep(0.2)
+            return 'slow'
+
+        hedger = RequestHedger(max_extra=0.05, min_samples=1)
+        hedger.latencies.append(0.05)
+        with mock.patch.object(shared_functions, 'api_get', side_effect=mock_api_get) as mock_get:
+            actual = (hedger.get('https://partner.archive-it.org/api/seed?id=1'), mock_get.call_count)
+        expected = ('slow', 1)
+        self.assertEqual(actual, expected, "Problem with test for max extra")
+
+    def test_min_samples(self):
+        """
+        Tests that no duplicate is sent before there are enough response times to calculate the delay.
+        """
+        hedger = RequestHedger(max_extra=1)
+        with mock.patch.object(shared_functions, 'api_get', return_value='response') as mock_get:
+            actual = (hedger.get('https://partner.archive-it.org/api/seed?id=1'), mock_get.call_count)
+        expected = ('response', 1)
+        self.assertEqual(actual, expected, "Problem with test for min samples")
+
+
+if __name__ == '__main__':
+    unittest.main()
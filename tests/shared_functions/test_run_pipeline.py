@@ -0,0 +1,99 @@
+"""
+Tests for the run_pipeline() shared function.
+It runs each stage of a pipeline in its own thread, joined by queues, and yields the results of the last stage.
+"""
+import random
+import time
+import unittest
+from shared_functions import run_pipeline
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_bounded(self):
+        """
+        Tests that the source is not read far ahead of the results that have been used.
+        With 2 stages of one worker and a queue size of 1, at most 13 of the 100 items can be read after the first
+        result is used: that result, one in each of the 3 queues, one waiting to be added by the source,
+        and for each stage, one in the worker, two in the reorder buffer, and one being passed on.
+        """
+        read = []
+
+        def source():
+            for number in range(100):
+                read.append(number)
+                yield number
+
+        results = run_pipeline(source(), [lambda item: item, lambda item: item], queue_size=1)
+        next(results)
+        time.sleep(0.5)
+        actual = len(read) <= 13
+        results.close()
+        self.assertEqual(actual, True, "Problem with test for bounded")
+
+    def test_error(self):
+        """
+        Tests that an error in a stage is raised after the results before it are yielded.
+        """
+        def stage(item):
+            if item == 3:
+                raise ValueError("API error")
+            return item
+
+        results = []
+        with self.assertRaises(ValueError):
+            for result in run_pipeline(range(5), [stage]):
+                results.append(result)
+        self.assertEqual(results, [0, 1, 2], "Problem with test for error")
+
+    def test_error_source(self):
+        """
+        Tests that an error from the source, such as a WASAPI API error, is raised.
+        """
+        def source():
+            yield 1
+            raise ValueError("API error")
+
+        with self.assertRaises(ValueError):
+            list(run_pipeline(source(), [lambda item: item]))
+
+    def test_reorder(self):
+        """
+        Tests that a stage with several workers, where items finish out of order, still yields them in order.
+        """
+        def stage(item):
+            time.sleep(random.uniform(0, 0.02))
+            return item
+
+        actual = list(run_pipeline(range(50), [(stage, 4), lambda item: item + 100]))
+        expected = list(range(100, 150))
+        self.assertEqual(actual, expected, "Problem with test for reorder")
+
+    def test_reorder_error(self):
+        """
+        Tests that an error in a stage with several workers is raised after every item before it is yielded.
+        """
+        def stage(item):
+            if item == 5:
+                raise ValueError("API error")
+            time.sleep(random.uniform(0, 0.02))
+            return item
+
+        results = []
+        with self.assertRaises(ValueError):
+            for result in run_pipeline(range(20), [(stage, 3)]):
+                results.append(result)
+        self.assertEqual(results, [0, 1, 2, 3, 4], "Problem with test for reorder error")
+
+    def test_stages(self):
+        """
+        Tests that every stage is run in order for each item, items stay in order, and None results are skipped.
+        """
+        stages = [lambda item: item * 2, lambda item: None if item == 4 else item, lambda item: f"item {item}"]
+        actual = list(run_pipeline(range(5), stages))
+        expected = ["item 0", "item 2", "item 6", "item 8"]
+        self.assertEqual(actual, expected, "Problem with test for stages")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for the single_flight() shared function.
+It is a decorator so calls to a function with the same arguments at the same time share one call.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+from shared_functions import single_flight
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_different_arguments(self):
+        """
+        Tests that calls with different arguments are not shared.
+        """
+        calls = []
+
+        @single_flight
+        def lookup(seed):
+            calls.append(seed)
+            time.sleep(0.1)
+            return f"seed {seed}"
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lookup, ["1", "2"]))
+        actual = (results, sorted(calls))
+        expected = (["seed 1", "seed 2"], ["1", "2"])
+        self.assertEqual(actual, expected, "Problem with test for different arguments")
+
+    def test_error(self):
+        """
+        Tests that every call that shared a call gets the error.
+        """
+        started = threading.Event()
+
+        @single_flight
+        def lookup(seed):
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("API error")
+
+        def call_lookup(seed):
+            try:
+                return lookup(seed)
+            except ValueError as error:
+                return str(error)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(call_lookup, "1")
+            started.wait()
+            second = pool.submit(call_lookup, "1")
+            actual = [first.result(), second.result()]
+        expected = ["API error", "API error"]
+        self.assertEqual(actual, expected, "Problem with test for error")
+
+    def test_not_cached(self):
+        """
+        Tests that the function is called again once the earlier call with the same arguments has finished.
+        """
+        calls = []
+
+        @single_flight
+        def lookup(seed):
+            calls.append(seed)
+            return f"seed {seed}"
+
+        actual = [lookup("1"), lookup("1"), len(calls)]
+        expected = ["seed 1", "seed 1", 2]
+        self.assertEqual(actual, expected, "Problem with test for not cached")
+
+    def test_shared(self):
+        """
+        Tests that calls with the same arguments at the same time share one call and get the same result.
+        """
+        calls = []
+        started = threading.Event()
+
+        @single_flight
+        def lookup(seed):
+            calls.append(seed)
+            started.set()
+            time.sleep(0.2)
+            return f"seed {seed}"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = pool.submit(lookup, "1")
+            started.wait()
+            others = [pool.submit(lookup, "1") for call in range(3)]
+            actual = ([first.result()] + [other.result() for other in others], len(calls))
+        expected = (["seed 1"] * 4, 1)
+        self.assertEqual(actual, expected, "Problem with test for shared")
+
+
+if __name__ == '__main__':
+    unittest.main()
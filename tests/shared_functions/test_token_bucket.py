@@ -0,0 +1,32 @@
+"""
+Tests for the TokenBucket shared class.
+It limits how many API calls are made per second by telling each API call how long to wait.
+"""
+import unittest
+from shared_functions import TokenBucket
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_burst(self):
+        """
+        Tests that API calls up to the capacity do not wait.
+        """
+        bucket = TokenBucket(2, capacity=3)
+        actual = [bucket.reserve() for call in range(3)]
+        expected = [0.0, 0.0, 0.0]
+        self.assertEqual(actual, expected, "Problem with test for burst")
+
+    def test_wait(self):
+        """
+        Tests that once the bucket is empty, each API call waits one more turn (1 / rate seconds) than the one before.
+        Rounds the waits since a tiny amount of time passes between API calls.
+        """
+        bucket = TokenBucket(2)
+        actual = [round(bucket.reserve(), 1) for call in range(5)]
+        expected = [0.0, 0.0, 0.5, 1.0, 1.5]
+        self.assertEqual(actual, expected, "Problem with test for wait")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Tests for the choose_seed_strategy() function from the warc_metadata_report.py script.
+It chooses how to get the seed metadata for a page of WARCs based on the number of seeds.
+"""
+import unittest
+from warc_metadata_report import choose_seed_strategy
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_batch(self):
+        """
+        Tests that the function returns batch when the report needs a small part of the account's seeds from the API.
+        """
+        actual = choose_seed_strategy(api_seeds=40, account_seeds=1000, new_seeds=25)
+        expected = 'batch'
+        self.assertEqual(actual, expected, "Problem with test for batch")
+
+    def test_index(self):
+        """
+        Tests that the function returns index when the report needs at least half of the account's seeds from the API.
+        """
+        actual = choose_seed_strategy(api_seeds=500, account_seeds=1000, new_seeds=25)
+        expected = 'index'
+        self.assertEqual(actual, expected, "Problem with test for index")
+
+    def test_no_account(self):
+        """
+        Tests that the function returns batch when the number of seeds in the account is not known.
+        """
+        actual = [choose_seed_strategy(500, None, 25), choose_seed_strategy(500, 0, 25)]
+        expected = ['batch', 'batch']
+        self.assertEqual(actual, expected, "Problem with test for no account")
+
+    def test_per_id(self):
+        """
+        Tests that the function returns per-id when there is only one new seed in the page.
+        """
+        actual = choose_seed_strategy(api_seeds=40, account_seeds=1000, new_seeds=1)
+        expected = 'per-id'
+        self.assertEqual(actual, expected, "Problem with test for per-id")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Tests for the count_lookup() function from the warc_metadata_report.py script.
+It counts one WARC's lookup of a seed or crawl job as a cache hit or a miss (from the Partner API).
+"""
+import unittest
+from warc_metadata_report import add_api_ids, count_lookup
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_api_ids(self):
+        """
+        Tests that only the first WARC to use an id requested from the Partner API is a miss,
+        and that ids that were not requested from the API (for example from the metadata cache) are hits,
+        so there is one count per WARC.
+        """
+        cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        add_api_ids(cache, ["1", "2"])
+        for seed in ["1", "1", "2", "3", "3", "1"]:
+            count_lookup(cache, seed)
+        actual = (cache['hits'], cache['misses'], cache['api_ids'])
+        expected = (4, 2, set())
+        self.assertEqual(actual, expected, "Problem with test for api ids")
+
+    def test_from_api(self):
+        """
+        Tests that a lookup that requests the id from the Partner API itself is a miss.
+        """
+        cache = {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        count_lookup(cache, "1", from_api=True)
+        count_lookup(cache, "1")
+        actual = (cache['hits'], cache['misses'])
+        expected = (1, 1)
+        self.assertEqual(actual, expected, "Problem with test for from api")
+
+
+if __name__ == '__main__':
+    unittest.main()
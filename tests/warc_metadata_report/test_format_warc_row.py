@@ -0,0 +1,38 @@
+"""
+Tests for the format_warc_row() function from the warc_metadata_report.py script.
+It returns the report row for one WARC from its WASAPI data and its seed and crawl job metadata.
+"""
+import unittest
+from warc_metadata_report import format_warc_row
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_row(self):
+        """
+        Tests that the function returns the expected row, including the size in GB, from the values it is given.
+        The seed and crawl job values are different from Archive-It to confirm the API was not used.
+        """
+        warc = {'account': 1468,
+                'checksums': {'md5': '9f3ca7026dd55bcfc02567081f27b1c8',
+                              'sha1': '0c1017435b5aa0f854bbfd2b25a7f42c86fc5fc8'},
+                'collection': 12262,
+                'crawl': 968139,
+                'crawl-start': '2019-09-10T13:16:30.452000Z',
+                'crawl-time': '2019-09-10T13:16:34.816000Z',
+                'filename': 'ARCHIVEIT-12262-CRAWL_SELECTED_SEEDS-JOB968139-SEED2018084-20190910131634816-00000-h3.warc.gz',
+                'filetype': 'warc',
+                'locations': [],
+                'size': 8190,
+                'store-time': '2019-09-10T13:20:03.873275Z'}
+        actual = format_warc_row(warc, "2018084", ("Test Collector", "Test Title"), 12345)
+        expected = ["Test Title", "Test Collector",
+                    "ARCHIVEIT-12262-CRAWL_SELECTED_SEEDS-JOB968139-SEED2018084-20190910131634816-00000-h3.warc.gz",
+                    12262, "2018084", 968139, 12345, "2019-09-10T13:20:03.873275Z", "2019-09-10T13:16:30.452000Z",
+                    "2019-09-10T13:16:34.816000Z", 8.19e-06, "warc", "9f3ca7026dd55bcfc02567081f27b1c8",
+                    "0c1017435b5aa0f854bbfd2b25a7f42c86fc5fc8"]
+        self.assertEqual(actual, expected, "Problem with test for row")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Tests for the get_collector_and_title() function from the warc_metadata_report.py script.
+It returns the collector (department) and title from the API data for one seed or default text if either is missing.
+"""
+import unittest
+from warc_metadata_report import get_collector_and_title
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_both(self):
+        """
+        Tests that the function returns the expected values for seed data with both collector and title.
+        """
+        seed_data = {'id': 1, 'metadata': {'Collector': [{'id': 1, 'value': 'Test Collector'}],
+                                           'Title': [{'id': 2, 'value': 'Test Title'}]}}
+        actual = get_collector_and_title(seed_data)
+        expected = ("Test Collector", "Test Title")
+        self.assertEqual(actual, expected, "Problem with test for both")
+
+    def test_deleted(self):
+        """
+        Tests that the function returns the expected values for a seed that is not in Archive-It.
+        """
+        actual = get_collector_and_title(None)
+        expected = ("No collector in Archive-It", "No title in Archive-It")
+        self.assertEqual(actual, expected, "Problem with test for deleted")
+
+    def test_neither(self):
+        """
+        Tests that the function returns the expected values for seed data with no collector and no title.
+        """
+        actual = get_collector_and_title({'id': 1, 'metadata': {}})
+        expected = ("No collector in Archive-It", "No title in Archive-It")
+        self.assertEqual(actual, expected, "Problem with test for neither")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Tests for the get_crawl_definition_batch() function from the warc_metadata_report.py script.
+It adds the crawl definition id for a list of crawl jobs to the crawl cache, using the id__in filter.
+"""
+import unittest
+from warc_metadata_report import get_crawl_definition_batch
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_batch(self):
+        """
+        Tests that the function caches the expected values for a job in Archive-It, a job not in Archive-It,
+        and duplicate jobs, and saves each job requested from the API once to be counted as a miss.
+        """
+        cache = {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        get_crawl_definition_batch([921607, 0, "921607"], cache)
+        actual = (cache['jobs'], cache['api_ids'], cache['misses'])
+        expected = ({'0': "Cannot get crawl definition: Job ID is not in Archive-It", '921607': 31104243716},
+                    {'0', '921607'}, 0)
+        self.assertEqual(actual, expected, "Problem with test for batch")
+
+    def test_not_batched(self):
+        """
+        Tests that the function does not cache a job id that is not a number or a job already cached.
+        """
+        cache = {'jobs': {'921607': 12345}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        get_crawl_definition_batch(["error", 921607], cache)
+        actual = (cache['jobs'], cache['api_ids'])
+        expected = ({'921607': 12345}, set())
+        self.assertEqual(actual, expected, "Problem with test for not batched")
+
+
+if __name__ == '__main__':
+    unittest.main()
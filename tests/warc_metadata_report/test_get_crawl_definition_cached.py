@@ -0,0 +1,43 @@
+"""
+Tests for the get_crawl_definition_cached() function from the warc_metadata_report.py script.
+It returns the crawl definition id for a crawl job, using the Partner API only if the job is not cached.
+"""
+import unittest
+from warc_metadata_report import get_crawl_definition_cached
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_hit(self):
+        """
+        Tests that the function returns the cached value and counts a hit for a job that is already in the cache.
+        The cached value is different from Archive-It to confirm the API was not used.
+        """
+        cache = {'jobs': {'921607': 12345}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        actual = (get_crawl_definition_cached(921607, cache), cache['hits'], cache['misses'])
+        expected = (12345, 1, 0)
+        self.assertEqual(actual, expected, "Problem with test for cache hit")
+
+    def test_miss(self):
+        """
+        Tests that the function returns the API value, counts a miss, and saves the job for a job not in the cache.
+        """
+        cache = {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        actual = (get_crawl_definition_cached(921607, cache), cache['hits'], cache['misses'], cache['jobs'])
+        expected = (31104243716, 0, 1, {'921607': 31104243716})
+        self.assertEqual(actual, expected, "Problem with test for cache miss")
+
+    def test_miss_error(self):
+        """
+        Tests that the function saves the default text for a job that is not in Archive-It,
+        so it is not looked up again.
+        """
+        cache = {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        get_crawl_definition_cached(0, cache)
+        actual = (get_crawl_definition_cached(0, cache), cache['hits'], cache['misses'])
+        expected = ("Cannot get crawl definition: Job ID is not in Archive-It", 1, 1)
+        self.assertEqual(actual, expected, "Problem with test for cache miss with error")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+"""
+Tests for the get_metadata_async() function from the warc_metadata_report.py script.
+It adds every seed and crawl job that is not already cached to the caches, looking them up with asyncio.
+"""
+import unittest
+from warc_metadata_report import get_metadata_async, get_metadata_concurrently
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_same_as_threads(self):
+        """
+        Tests that the function caches the same values as get_metadata_concurrently(),
+        for seeds and jobs with metadata, without metadata, and with API errors.
+        """
+        seeds = ["2089428", "2209286", "2200062", "2016223", "2024250", "error"]
+        jobs = [921607, 938127, 0, "error"]
+        async_caches = [{'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0},
+                        {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}]
+        get_metadata_async(seeds, jobs, async_caches[0], async_caches[1], 10)
+        thread_caches = [{'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0},
+                         {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}]
+        get_metadata_concurrently(seeds, jobs, thread_caches[0], thread_caches[1], 2)
+        self.assertEqual(async_caches, thread_caches, "Problem with test for same as threads")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+Tests for the get_metadata_concurrently() function from the warc_metadata_report.py script.
+It adds every seed and crawl job that is not already cached to the caches, looking them up with a pool of threads.
+"""
+import unittest
+from warc_metadata_report import get_metadata_concurrently
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_lookups(self):
+        """
+        Tests that the function caches the expected values for new seeds and jobs, including errors,
+        and does not change or save to be counted the seeds and jobs that were already cached.
+        """
+        seed_cache = {'seeds': {'2089428': ("Test Collector", "Test Title")}, 'api_ids': set(), 'hits': 0,
+                      'misses': 0}
+        crawl_cache = {'jobs': {'921607': 12345}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        get_metadata_concurrently(["2089428", "2209286", "2209286", "error"], [921607, 0, "error"],
+                                  seed_cache, crawl_cache, 4)
+        actual = [seed_cache, crawl_cache]
+        expected = [{'seeds': {'2089428': ("Test Collector", "Test Title"),
+                               '2209286': ("The Digital Library of Georgia", "No title in Archive-It"),
+                               'error': ("Cannot get collector. API error 500 for seed report.",
+                                         "Cannot get title. API error 500 for seed report.")},
+                     'api_ids': {'2209286', 'error'}, 'hits': 0, 'misses': 0},
+                    {'jobs': {'921607': 12345,
+                              '0': "Cannot get crawl definition: Job ID is not in Archive-It",
+                              'error': "API Error for job report"},
+                     'api_ids': {'0', 'error'}, 'hits': 0, 'misses': 0}]
+        self.assertEqual(actual, expected, "Problem with test for lookups")
+
+
+if __name__ == '__main__':
+    unittest.main()
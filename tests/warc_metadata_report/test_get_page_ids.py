@@ -0,0 +1,46 @@
+"""
+Tests for the get_page_ids() function from the warc_metadata_report.py script.
+It gets the seed and crawl job ids for a page of WARCs, skipping WARCs already in the report.
+"""
+import unittest
+from warc_metadata_report import get_page_ids
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Variable with a page of WASAPI data, only including the fields used by the function.
+        """
+        self.warc_page = [{'filename': 'ARCHIVEIT-12181-TEST-JOB1594318-SEED2027713-20220407151744773-00000-h3.warc.gz',
+                           'crawl': 1594318},
+                          {'filename': 'ARCHIVEIT-12181-TEST-JOB1594318-SEED2027707-20220407151744773-00000-h3.warc.gz',
+                           'crawl': 1594318}]
+
+    def test_all_skipped(self):
+        """
+        Tests that the function returns None when every WARC in the page is skipped.
+        """
+        skip_filenames = {warc['filename']: [] for warc in self.warc_page}
+        actual = get_page_ids(self.warc_page, skip_filenames)
+        self.assertEqual(actual, None, "Problem with test for all skipped")
+
+    def test_ids(self):
+        """
+        Tests that the function returns the seed and crawl job ids in the same order as the WARCs.
+        """
+        actual = get_page_ids(self.warc_page, {})
+        expected = (self.warc_page, ['2027713', '2027707'], [1594318, 1594318])
+        self.assertEqual(actual, expected, "Problem with test for ids")
+
+    def test_skipped(self):
+        """
+        Tests that the function does not include WARCs that are already in the report.
+        """
+        actual = get_page_ids(self.warc_page, {self.warc_page[0]['filename']: []})
+        expected = (self.warc_page[1:], ['2027707'], [1594318])
+        self.assertEqual(actual, expected, "Problem with test for skipped")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+Tests for the get_results_in_order() function from the warc_metadata_report.py script.
+It runs a function with a pool of threads and yields the results in the same order as the arguments.
+"""
+import time
+import unittest
+from warc_metadata_report import get_results_in_order
+
+
+def wait_and_return(wait, value):
+    """
+    Function to run for the tests, which finishes in a different order than it is started.
+    """
+    time.sleep(wait)
+    return value
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_error(self):
+        """
+        Tests that the function raises the error from the function it runs.
+        """
+        with self.assertRaises(ZeroDivisionError):
+            list(get_results_in_order(divmod, [(1, 1), (1, 0)], 2))
+
+    def test_order(self):
+        """
+        Tests that the function yields the results in argument order when later calls finish first.
+        """
+        arguments = [(0.3, "a"), (0.2, "b"), (0.1, "c"), (0, "d")]
+        actual = list(get_results_in_order(wait_and_return, arguments, 3))
+        expected = ["a", "b", "c", "d"]
+        self.assertEqual(actual, expected, "Problem with test for order")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for the get_seed_index() function from the warc_metadata_report.py script.
+It adds the collector and title for every seed in the account to the seed cache with one API call.
+"""
+import os
+import unittest
+from unittest.mock import Mock, patch
+import configuration as c
+from shared_functions import cache_connect, cache_count, cache_get
+from warc_metadata_report import get_seed_index
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a metadata cache in the script_output folder for testing.
+        """
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            self.connection = cache_connect()
+
+    def tearDown(self):
+        """
+        Deletes the test metadata cache.
+        """
+        self.connection.close()
+        os.remove(os.path.join(c.script_output, "metadata_cache.sqlite"))
+
+    def test_api_error(self):
+        """
+        Tests that the function returns False and saves nothing if the API call has an error.
+        """
+        cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        with patch('shared_functions.api_get', return_value=Mock(status_code=500)):
+            actual = (get_seed_index(cache, self.connection), cache['seeds'], cache_count(self.connection, 'seed'))
+        expected = (False, {}, None)
+        self.assertEqual(actual, expected, "Problem with test for api error")
+
+    def test_seeds(self):
+        """
+        Tests that the function adds every seed to the seed cache and saves the seeds
+        and the number of seeds in the account to the metadata cache.
+        """
+        seeds = [{'id': 1, 'metadata': {'Collector': [{'value': 'Dept'}], 'Title': [{'value': 'One'}]}},
+                 {'id': 2, 'metadata': {}}]
+        cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        with patch('shared_functions.api_get', return_value=Mock(status_code=200, json=Mock(return_value=seeds))):
+            result = get_seed_index(cache, self.connection)
+        actual = (result, cache['seeds'], cache['api_ids'], cache_count(self.connection, 'seed'),
+                  sorted(cache_get(self.connection, 'seed', ['1', '2'])))
+        expected = (True, {'1': ('Dept', 'One'), '2': ('No collector in Archive-It', 'No title in Archive-It')}, {'1', '2'}, 2, ['1', '2'])
+        self.assertEqual(actual, expected, "Problem with test for seeds")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+Tests for the get_seed_metadata_batch() function from the warc_metadata_report.py script.
+It adds the collector (department) and title for a list of seeds to the seed cache, using the id__in filter.
+"""
+import unittest
+from warc_metadata_report import get_seed_metadata, get_seed_metadata_batch
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_batch(self):
+        """
+        Tests that the function caches the same values as get_seed_metadata() for seeds with and without metadata,
+        a deleted seed, and duplicate seeds, and saves each seed requested from the API once to be counted as a miss.
+        """
+        seeds = ["2089428", "2209286", "2200062", "2016223", "2024250", "2089428"]
+        cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        get_seed_metadata_batch(seeds, cache, chunk_size=2)
+        actual = (cache['seeds'], cache['api_ids'], cache['misses'])
+        expected = ({seed: get_seed_metadata(seed) for seed in seeds}, set(seeds), 0)
+        self.assertEqual(actual, expected, "Problem with test for batch")
+
+    def test_not_batched(self):
+        """
+        Tests that the function does not cache a seed id that could not be calculated or a seed already cached.
+        """
+        cache = {'seeds': {'2089428': ("Test Collector", "Test Title")}, 'api_ids': set(), 'hits': 0,
+                 'misses': 0}
+        get_seed_metadata_batch(["COULD NOT CALCULATE SEED ID", "2089428"], cache)
+        actual = (cache['seeds'], cache['api_ids'])
+        expected = ({'2089428': ("Test Collector", "Test Title")}, set())
+        self.assertEqual(actual, expected, "Problem with test for not batched")
+
+
+if __name__ == '__main__':
+    unittest.main()
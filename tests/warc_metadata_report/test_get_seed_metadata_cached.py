@@ -0,0 +1,34 @@
+"""
+Tests for the get_seed_metadata_cached() function from the warc_metadata_report.py script.
+It returns the collector (department) and title for a seed, using the Partner API only if the seed is not cached.
+"""
+import unittest
+from warc_metadata_report import get_seed_metadata_cached
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_hit(self):
+        """
+        Tests that the function returns the cached values and counts a hit for a seed that is already in the cache.
+        The cached values are different from Archive-It to confirm the API was not used.
+        """
+        cache = {'seeds': {'2089428': ("Test Collector", "Test Title")}, 'api_ids': set(), 'hits': 0,
+                 'misses': 0}
+        actual = (get_seed_metadata_cached("2089428", cache), cache['hits'], cache['misses'])
+        expected = (("Test Collector", "Test Title"), 1, 0)
+        self.assertEqual(actual, expected, "Problem with test for cache hit")
+
+    def test_miss(self):
+        """
+        Tests that the function returns the API values, counts a miss, and saves the seed for a seed not in the cache.
+        """
+        cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        actual = (get_seed_metadata_cached("2089428", cache), cache['hits'], cache['misses'], list(cache['seeds']))
+        expected = (("Richard B. Russell Library for Political Research and Studies",
+                     "Southern Alliance for Clean Energy"), 0, 1, ["2089428"])
+        self.assertEqual(actual, expected, "Problem with test for cache miss")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests for the get_seed_metadata_saved() function from the warc_metadata_report.py script.
+It adds the collector (department) and title for seeds saved in the metadata cache to the seed cache.
+"""
+import os
+import unittest
+from unittest.mock import patch
+import configuration as c
+from shared_functions import cache_connect, cache_save
+from warc_metadata_report import get_seed_metadata_saved
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Makes a metadata cache in the script_output folder for testing.
+        """
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            self.connection = cache_connect()
+
+    def tearDown(self):
+        """
+        Deletes the test metadata cache.
+        """
+        self.connection.close()
+        os.remove(os.path.join(c.script_output, "metadata_cache.sqlite"))
+
+    def test_no_connection(self):
+        """
+        Tests that the function returns every seed not in the seed cache when there is no metadata cache.
+        """
+        cache = {'seeds': {'3': ("Cached Collector", "Cached Title")}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        actual = get_seed_metadata_saved(["4", "3", "1"], cache)
+        expected = ["1", "4"]
+        self.assertEqual(actual, expected, "Problem with test for no connection")
+
+
+    def test_saved(self):
+        """
+        Tests that the function adds saved seeds, including a deleted seed, to the seed cache
+        and returns the seeds in neither cache once each.
+        The saved values are different from Archive-It to confirm the API was not used.
+        """
+        cache_save(self.connection, "seed", {"1": {"metadata": {"Collector": [{"value": "Test Collector"}],
+                                                                "Title": [{"value": "Test Title"}]}},
+                                             "2": None})
+        cache = {'seeds': {'3': ("Cached Collector", "Cached Title")}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+        new_seeds = get_seed_metadata_saved(["1", "2", "3", "4", "4", "COULD NOT CALCULATE SEED ID"], cache,
+                                            self.connection)
+        actual = (new_seeds, cache['seeds'])
+        expected = (["4", "COULD NOT CALCULATE SEED ID"],
+                    {'1': ("Test Collector", "Test Title"),
+                     '2': ("No collector in Archive-It", "No title in Archive-It"),
+                     '3': ("Cached Collector", "Cached Title")})
+        self.assertEqual(actual, expected, "Problem with test for saved")
+
+if __name__ == '__main__':
+    unittest.main()
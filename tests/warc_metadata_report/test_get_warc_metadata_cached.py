@@ -0,0 +1,52 @@
+"""
+Tests for the get_warc_metadata_cached() function from the warc_metadata_report.py script.
+It yields the WARC metadata one page at a time from the WASAPI cache, or from WASAPI and saves it to the cache.
+"""
+import os
+import unittest
+from unittest.mock import patch
+import configuration as c
+from warc_metadata_report import get_warc_metadata, get_warc_metadata_cached
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Variable with the cache file path for the date range used in the tests.
+        """
+        self.cache_path = os.path.join(c.script_output, "wasapi_2021-03-15_2021-03-19.jsonl")
+
+    def tearDown(self):
+        """
+        Deletes the test cache file, if it was made.
+        """
+        if os.path.exists(self.cache_path):
+            os.remove(self.cache_path)
+
+    def test_read_cache(self):
+        """
+        Tests that the function yields the WARCs from the cache file, in pages of page_size WARCs.
+        The cache file has test data, different from WASAPI, to confirm the API was not used.
+        """
+        with open(self.cache_path, 'w') as cache_file:
+            cache_file.write('{"filename": "one.warc.gz"}\n{"filename": "two.warc.gz"}\n{"filename": "three.warc.gz"}\n')
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            actual = list(get_warc_metadata_cached("2021-03-15", "2021-03-19", page_size=2))
+        expected = [[{"filename": "one.warc.gz"}, {"filename": "two.warc.gz"}], [{"filename": "three.warc.gz"}]]
+        self.assertEqual(actual, expected, "Problem with test for read cache")
+
+    def test_save_cache(self):
+        """
+        Tests that the function yields the WASAPI data and saves it to the cache, which then gives the same WARCs.
+        """
+        expected = [warc for page in get_warc_metadata("2021-03-15", "2021-03-19") for warc in page]
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            from_api = [warc for page in get_warc_metadata_cached("2021-03-15", "2021-03-19") for warc in page]
+            from_cache = [warc for page in get_warc_metadata_cached("2021-03-15", "2021-03-19") for warc in page]
+        actual = (from_api, from_cache, os.path.exists(self.cache_path))
+        self.assertEqual(actual, (expected, expected, True), "Problem with test for save cache")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+"""
+Tests for the get_warc_metadata_sharded() function from the warc_metadata_report.py script.
+It yields the WARC metadata from WASAPI one date window at a time, without duplicate WARCs.
+"""
+import unittest
+from warc_metadata_report import get_warc_metadata, get_warc_metadata_sharded
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_same_as_unsharded(self):
+        """
+        Tests that the function returns the same WARCs in the same order as get_warc_metadata() for each shard size.
+        """
+        expected = [warc for page in get_warc_metadata("2022-07-15", "2022-10-26") for warc in page]
+        for shard in ("daily", "weekly", "monthly"):
+            actual = [warc for window in get_warc_metadata_sharded("2022-07-15", "2022-10-26", shard, workers=4)
+                      for warc in window]
+            self.assertEqual(actual, expected, f"Problem with test for same as unsharded: {shard}")
+
+
+if __name__ == '__main__':
+    unittest.main()
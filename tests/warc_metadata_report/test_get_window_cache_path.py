@@ -0,0 +1,35 @@
+"""
+Tests for the get_window_cache_path() function from the warc_metadata_report.py script.
+It returns the path to the WASAPI cache file for a date range, or None if the date range cannot be cached.
+"""
+from datetime import date, timedelta
+import os
+import unittest
+from unittest.mock import patch
+import configuration as c
+from warc_metadata_report import get_window_cache_path
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_includes_today(self):
+        """
+        Tests that the function returns None for a date range that ends after today.
+        """
+        end = (date.today() + timedelta(days=2)).strftime('%Y-%m-%d')
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            actual = get_window_cache_path("2022-01-01", end)
+        self.assertEqual(actual, None, "Problem with test for includes today")
+
+    def test_past(self):
+        """
+        Tests that the function returns the expected path for a date range that is entirely in the past.
+        """
+        with patch.object(c, 'cache_folder', c.script_output, create=True):
+            actual = get_window_cache_path("2022-01-01", "2022-02-01")
+        expected = os.path.join(c.script_output, "wasapi_2022-01-01_2022-02-01.jsonl")
+        self.assertEqual(actual, expected, "Problem with test for past")
+
+
+if __name__ == '__main__':
+    unittest.main()
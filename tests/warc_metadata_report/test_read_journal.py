@@ -0,0 +1,59 @@
+"""
+Tests for the read_journal() and save_journal() functions from the warc_metadata_report.py script.
+They save the report row for each finished WARC to a checkpoint journal and read them back to resume a run.
+"""
+import os
+import unittest
+from configuration import script_output
+from warc_metadata_report import read_journal, save_journal
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Variable with the test journal path, which is used multiple times.
+        """
+        self.journal_path = f"{script_output}/warc_metadata_2022-01-01_2022-01-31_journal.jsonl"
+
+    def tearDown(self):
+        """
+        Deletes the test journal, if it was made.
+        """
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+    def test_incomplete_line(self):
+        """
+        Tests that the function skips a line that was only partly saved, so that WARC is done again.
+        """
+        save_journal(self.journal_path, [{'filename': 'warc1.warc.gz'}], [["row1"]])
+        with open(self.journal_path, 'a') as journal:
+            journal.write('{"filename": "warc2.warc.gz", "ro')
+        actual = read_journal(self.journal_path)
+        expected = {'warc1.warc.gz': ["row1"]}
+        self.assertEqual(actual, expected, "Problem with test for incomplete line")
+
+    def test_no_journal(self):
+        """
+        Tests that the function returns an empty dictionary when there is no journal.
+        """
+        actual = read_journal(self.journal_path)
+        expected = {}
+        self.assertEqual(actual, expected, "Problem with test for no journal")
+
+    def test_pages(self):
+        """
+        Tests that the function returns the rows from every page saved to the journal.
+        """
+        save_journal(self.journal_path, [{'filename': 'warc1.warc.gz'}, {'filename': 'warc2.warc.gz'}],
+                     [["row1", "1.5"], ["row2", "2.5"]])
+        save_journal(self.journal_path, [{'filename': 'warc3.warc.gz'}], [["row3", "3.5"]])
+        actual = read_journal(self.journal_path)
+        expected = {'warc1.warc.gz': ["row1", "1.5"], 'warc2.warc.gz': ["row2", "2.5"],
+                    'warc3.warc.gz': ["row3", "3.5"]}
+        self.assertEqual(actual, expected, "Problem with test for pages")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+Tests for the split_date_range() function from the warc_metadata_report.py script.
+It returns a list of daily, weekly, or monthly date windows for a date range, newest first.
+"""
+import unittest
+from warc_metadata_report import split_date_range
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_daily(self):
+        """
+        Tests that the function returns the expected windows for daily windows.
+        """
+        actual = split_date_range("2022-12-30", "2023-01-02", "daily")
+        expected = [("2023-01-01", "2023-01-02"), ("2022-12-31", "2023-01-01"), ("2022-12-30", "2022-12-31")]
+        self.assertEqual(actual, expected, "Problem with test for daily")
+
+    def test_monthly(self):
+        """
+        Tests that the function returns the expected windows for monthly windows,
+        which are calendar months except at the start and end of the date range.
+        """
+        actual = split_date_range("2022-01-15", "2022-04-10", "monthly")
+        expected = [("2022-04-01", "2022-04-10"), ("2022-03-01", "2022-04-01"), ("2022-02-01", "2022-03-01"),
+                    ("2022-01-15", "2022-02-01")]
+        self.assertEqual(actual, expected, "Problem with test for monthly")
+
+    def test_weekly(self):
+        """
+        Tests that the function returns the expected windows for weekly windows, with a shorter final window.
+        """
+        actual = split_date_range("2022-02-01", "2022-02-18", "weekly")
+        expected = [("2022-02-15", "2022-02-18"), ("2022-02-08", "2022-02-15"), ("2022-02-01", "2022-02-08")]
+        self.assertEqual(actual, expected, "Problem with test for weekly")
+
+
+if __name__ == '__main__':
+    unittest.main()
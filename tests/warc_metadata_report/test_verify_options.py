@@ -0,0 +1,143 @@
+"""
+Tests for the verify_options() function from the warc_metadata_report.py script.
+It returns a dictionary with the value of each optional argument and a list of errors.
+"""
+import unittest
+from warc_metadata_report import verify_options
+
+
+class MyTestCase(unittest.TestCase):
+
+    def test_adaptive(self):
+        """
+        Tests that the function returns adaptive as True and the default connection pool size for auto workers.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--workers", "auto"])
+        actual = (options['adaptive'], options['workers'], errors)
+        expected = (True, 20, [])
+        self.assertEqual(actual, expected, "Problem with test for adaptive")
+
+    def test_backend(self):
+        """
+        Tests that the function returns the expected backend.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--backend", "async"])
+        actual = (options['backend'], errors)
+        expected = ('async', [])
+        self.assertEqual(actual, expected, "Problem with test for backend")
+
+    def test_default(self):
+        """
+        Tests that the function returns the default options when there are no optional arguments.
+        """
+        actual = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01"])
+        expected = ({'workers': 1, 'backend': 'threads', 'page_size': 500, 'page_workers': 1, 'shard': None,
+                     'resume': False, 'adaptive': False, 'hedge': False, 'seeds': 'auto'}, [])
+        self.assertEqual(actual, expected, "Problem with test for default")
+
+    def test_error_backend(self):
+        """
+        Tests that the function returns the expected error for a backend that is not threads or async.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--backend", "fast"])
+        actual = (options['backend'], errors)
+        expected = ('threads', ["Value 'fast' for --backend is not threads or async."])
+        self.assertEqual(actual, expected, "Problem with test for error: backend")
+
+    def test_error_number(self):
+        """
+        Tests that the function returns the expected errors for number values that are not a number or are missing.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--workers", "0", "--page-size", "a", "--page-workers"])
+        actual = (options['workers'], options['page_size'], options['page_workers'], errors)
+        expected = (1, 500, 1, ["Value '0' for --workers is not a whole number greater than 0.",
+                                "Value 'a' for --page-size is not a whole number greater than 0.",
+                                "Value '' for --page-workers is not a whole number greater than 0."])
+        self.assertEqual(actual, expected, "Problem with test for error: number")
+
+    def test_error_seeds(self):
+        """
+        Tests that the function returns the expected error for a seeds strategy that is not an option.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--seeds", "all"])
+        actual = (options['seeds'], errors)
+        expected = ('auto', ["Value 'all' for --seeds is not auto, per-id, batch, or index."])
+        self.assertEqual(actual, expected, "Problem with test for error: seeds")
+
+    def test_error_shard(self):
+        """
+        Tests that the function returns the expected error for a shard that is not daily, weekly, or monthly.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--shard", "hourly"])
+        actual = (options['shard'], errors)
+        expected = (None, ["Value 'hourly' for --shard is not daily, weekly, or monthly."])
+        self.assertEqual(actual, expected, "Problem with test for error: shard")
+
+    def test_error_unknown(self):
+        """
+        Tests that the function returns the expected error for an optional argument that is not recognized.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01", "--fast"])
+        actual = errors
+        expected = ["Optional argument '--fast' is not recognized."]
+        self.assertEqual(actual, expected, "Problem with test for error: unknown")
+
+    def test_hedge(self):
+        """
+        Tests that the function returns hedge as True when the hedge flag is used, which has no value.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01", "--hedge"])
+        actual = (options['hedge'], errors)
+        expected = (True, [])
+        self.assertEqual(actual, expected, "Problem with test for hedge")
+
+    def test_number(self):
+        """
+        Tests that the function returns the expected values for the options that are numbers.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--workers", "8", "--page-size", "1000", "--page-workers", "4"])
+        actual = (options['workers'], options['page_size'], options['page_workers'], errors)
+        expected = (8, 1000, 4, [])
+        self.assertEqual(actual, expected, "Problem with test for number")
+
+
+    def test_resume(self):
+        """
+        Tests that the function returns resume as True when the resume flag is used, which has no value.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--resume", "--workers", "4"])
+        actual = (options['resume'], options['workers'], errors)
+        expected = (True, 4, [])
+        self.assertEqual(actual, expected, "Problem with test for resume")
+
+    def test_seeds(self):
+        """
+        Tests that the function returns the expected seeds strategy.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--seeds", "index"])
+        actual = (options['seeds'], errors)
+        expected = ('index', [])
+        self.assertEqual(actual, expected, "Problem with test for seeds")
+
+    def test_shard(self):
+        """
+        Tests that the function returns the expected shard.
+        """
+        options, errors = verify_options(["C:/path/warc_metadata_report.py", "2017-11-01", "2018-01-01",
+                                          "--shard", "weekly"])
+        actual = (options['shard'], errors)
+        expected = ('weekly', [])
+        self.assertEqual(actual, expected, "Problem with test for shard")
+
+
+if __name__ == '__main__':
+    unittest.main()
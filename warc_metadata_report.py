@@ -23,14 +23,32 @@ The report includes the following fields:
 Parameters:
     start_date : required, formatted YYYY-MM-DD. First store date of WARCs to include.
     end_date : required, formatted YYYY-MM-DD. First store date of WARCs NOT to include (last date included is the day before end_date).
+    --workers N|auto : optional, after the dates. Number of Partner API calls to make at the same time (default 1),
+                       or auto to adjust it while the script runs.
+    --backend threads|async : optional, after the dates. Make Partner API calls with threads (default) or asyncio.
+    --page-size N : optional, after the dates. Number of WARCs to get from WASAPI with each API call (default 500).
+    --page-workers N : optional, after the dates. Number of WASAPI pages (or windows) to request and enrich at once
+                       (default 1). The pages share the --workers limit on Partner API calls.
+    --shard daily|weekly|monthly : optional, after the dates. Request WARCs from WASAPI in windows of this size.
+    --resume : optional, after the dates. Continue a run for the same dates that did not finish.
+    --hedge : optional, after the dates. Send a duplicate seed or crawl job API call if the response is slow.
+    --seeds auto|per-id|batch|index : optional, after the dates. How to get seed metadata from the Partner API
+                                      (default auto, which picks one based on the number of seeds).
 
 Returns:
     A CSV file saved to the script_output folder with WARC metadata from Archive-It.
 """
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import functools
+import json
+import math
+import os
 import re
 import requests
 import sys
+import threading
 
 try:
     import configuration as c
@@ -40,6 +58,49 @@ except ModuleNotFoundError:
     sys.exit()
 import shared_functions as fun
 
+# Lock for changing the number of cache hits and misses, which more than one thread can do (see count_lookup()).
+lookup_lock = threading.Lock()
+
+# Seeds and crawl jobs being requested from the Partner API, so pages being enriched at the same time
+# request each id once, in a batch or by itself (see fun.InFlightIds).
+in_flight_seeds = fun.InFlightIds()
+in_flight_jobs = fun.InFlightIds()
+
+
+def add_api_ids(cache, record_ids):
+    """Add seeds or crawl jobs that were requested from the Partner API to the ids to count as misses.
+
+    Each of these ids is counted as a miss the first time a WARC uses it (see count_lookup()).
+
+    Parameters:
+        cache : dictionary with the seeds or crawl jobs already looked up and the number of cache hits and misses
+        record_ids : list of Seed IDs or Crawl Job IDs (as strings) that were requested from the Partner API
+
+    Returns:
+        Nothing
+    """
+    with lookup_lock:
+        cache['api_ids'].update(record_ids)
+
+
+def cache_reports(connection, record_type, record_ids, reports):
+    """Save seed or crawl job reports requested from the Partner API one id at a time to the metadata cache.
+
+    Reports with an API error are not saved. An empty report is saved as the id not being in Archive-It.
+
+    Parameters:
+        connection : connection to the metadata cache, or None if there is no metadata cache
+        record_type : type of Partner API data, seed or crawl_job
+        record_ids : list of Seed IDs or Crawl Job IDs (as strings)
+        reports : list of tuples with the API status code and report (json) for each id, in the same order
+
+    Returns:
+        Nothing
+    """
+    records = {record_id: py_report[0] if len(py_report) > 0 else None
+               for record_id, (status_code, py_report) in zip(record_ids, reports) if status_code == 200}
+    fun.cache_save(connection, record_type, records)
+
 
 def calculate_seed_id(warc_name):
     """Identify the Seed Id component of the WARC filename.
@@ -58,6 +119,192 @@ def calculate_seed_id(warc_name):
     return seed_id
 
 
+def choose_seed_strategy(api_seeds, account_seeds, new_seeds):
+    """Choose how to get the seed metadata for a page of WARCs from the Partner API, for the auto seeds option.
+
+    The strategies are:
+        per-id : one API call per seed, which is the smallest API call when there is only one new seed
+        batch : one API call per 100 seeds with the id__in filter
+        index : one API call for every seed in the account, the same as the seed report, which is used for the rest
+                of the run. This is the fewest API calls once the report needs a large part of the account's seeds
+                from the API. It is never picked if the number of seeds in the account is not known.
+
+    Parameters:
+        api_seeds : number of different seeds in the report so far, including this page, that were not in
+                    the metadata cache and so need the Partner API
+        account_seeds : number of seeds in the account, or None if it is not known
+        new_seeds : number of seeds in this page that are not in the seed cache or the metadata cache
+
+    Returns:
+        per-id, batch, or index
+    """
+    if account_seeds and api_seeds >= account_seeds / 2:
+        return 'index'
+    if new_seeds <= 1:
+        return 'per-id'
+    return 'batch'
+
+
+def count_lookup(cache, record_id, from_api=False):
+    """Count one WARC's lookup of a seed or crawl job as a cache hit or a miss (from the Partner API).
+
+    There is one lookup per WARC. The first lookup of an id that was requested from the Partner API during this run
+    is a miss, and every other lookup is a hit, including ids from the metadata cache.
+    Several pages can be enriched at the same time, so this uses a lock to not lose any counts.
+
+    Parameters:
+        cache : dictionary with the seeds or crawl jobs already looked up, the ids requested from the Partner API
+                that have not been counted yet (api_ids), and the number of cache hits and misses
+        record_id : Seed ID or Crawl Job ID (as a string)
+        from_api : if the WARC's lookup is requesting the id from the Partner API (Boolean)
+
+    Returns:
+        Nothing
+    """
+    with lookup_lock:
+        if from_api or record_id in cache['api_ids']:
+            cache['api_ids'].discard(record_id)
+            cache['misses'] += 1
+        else:
+            cache['hits'] += 1
+
+
+def enrich_page(page_ids, seed_cache, crawl_cache, options, seed_state, connection=None):
+    """Get the seed and crawl job metadata for a page of WARCs, the enrichment stage of the report pipeline.
+
+    Seeds and crawl jobs saved in the metadata cache (if configured) are used first. The rest of the seeds are looked up
+    with the seeds option (see choose_seed_strategy()) and crawl jobs in batches, and then one id at a time
+    for anything not found, using a pool of threads or asyncio (the backend option).
+    This is the only stage that changes the caches. Several pages can be enriched at the same time (page_workers),
+    which may finish out of order, so run_pipeline() puts them back in order before the next stage.
+    Each page has its own threads for the API calls, but the script's Partner API concurrency controller
+    limits the API calls for every page together to the workers option.
+
+    With more than one page worker, several threads add to the same caches at the same time, which is safe because:
+        * the seeds and jobs dictionaries are only changed by adding one id at a time, which Python does in one step,
+          and are never looped over while pages are enriched.
+        * the ids requested from the API and the number of hits and misses are only changed with lookup_lock.
+        * the seed state is only used with its lock, and the metadata cache with fun.cache_lock.
+        * pages that need the same id from the API at the same time request it once, in a batch or by itself,
+          and the other pages wait for it to be added to the cache (see fun.InFlightIds).
+
+    Parameters:
+        page_ids : tuple with the list of WARCs in the page, their seed ids, and their crawl job ids
+        seed_cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        crawl_cache : dictionary with the crawl jobs already looked up and the number of cache hits and misses
+        options : dictionary with the value of each option, from verify_options()
+        seed_state : dictionary with the seeds in the report so far that need the Partner API (api_seeds),
+                     the number of seeds in the account (account_seeds), if the seed index has been requested
+                     (index_tried), and a lock for using them
+        connection : connection to the metadata cache, or None if there is no metadata cache
+
+    Returns:
+        List of tuples with the WASAPI data, seed id, seed metadata (collector and title),
+        and crawl definition for each WARC in the page.
+    """
+    warc_page, seed_ids, crawl_jobs = page_ids
+
+    # Seeds saved in the metadata cache (if configured) are used with every seed strategy,
+    # so only the seeds that are not in either cache are new seeds that need the Partner API.
+    new_seeds = get_seed_metadata_saved(seed_ids, seed_cache, connection)
+
+    # Picks the seed strategy for this page, and gets every seed in the account the first time index is picked.
+    # The seed state is shared by every page being enriched, so only one page at a time can use it.
+    with seed_state['lock']:
+        seed_state['api_seeds'].update(seed for seed in new_seeds if seed.isdigit())
+        seed_strategy = options['seeds']
+        if seed_strategy == 'auto':
+            seed_strategy = choose_seed_strategy(len(seed_state['api_seeds']), seed_state['account_seeds'],
+                                                 len(new_seeds))
+        if seed_strategy == 'index' and not seed_state['index_tried']:
+            seed_state['index_tried'] = True
+            if not get_seed_index(seed_cache, connection):
+                print("\nCould not get every seed due to a Partner API error. Seeds will be looked up in batches.")
+
+    # Seeds and crawl jobs looked up one at a time are also saved to the metadata cache.
+    if seed_strategy != 'per-id':
+        get_seed_metadata_batch(new_seeds, seed_cache, workers=options['workers'], backend=options['backend'],
+                                connection=connection)
+    get_crawl_definition_batch(crawl_jobs, crawl_cache, workers=options['workers'], backend=options['backend'],
+                               connection=connection)
+    if options['backend'] == 'async':
+        get_metadata_async(seed_ids, crawl_jobs, seed_cache, crawl_cache, options['workers'], connection)
+    else:
+        get_metadata_concurrently(seed_ids, crawl_jobs, seed_cache, crawl_cache, options['workers'], connection)
+
+    return [(warc, seed_id, get_seed_metadata_cached(seed_id, seed_cache),
+             get_crawl_definition_cached(crawl_job, crawl_cache))
+            for warc, seed_id, crawl_job in zip(warc_page, seed_ids, crawl_jobs)]
+
+
+def format_rows(enriched_page):
+    """Make the report rows for a page of WARCs, the row formatting stage of the report pipeline.
+
+    Parameter:
+        enriched_page : list of tuples from enrich_page()
+
+    Returns:
+        Tuple with the list of WARCs in the page and the list of their report rows, in the same order.
+    """
+    warc_page = [warc for warc, seed_id, seed_metadata, crawl_definition in enriched_page]
+    rows = [format_warc_row(*enriched_warc) for enriched_warc in enriched_page]
+    return warc_page, rows
+
+
+def format_warc_row(warc, seed_id, seed_metadata, crawl_definition):
+    """Make the report row for one WARC from its WASAPI data and its seed and crawl job metadata.
+
+    Parameters:
+        warc : WASAPI data for the WARC
+        seed_id : Seed ID in Archive-It, or default text if it could not be calculated
+        seed_metadata : tuple with the collector and title for the seed
+        crawl_definition : Crawl Definition ID, or default text if it could not be obtained
+
+    Returns:
+        A list with the values for the WARC metadata report row.
+    """
+    seed_collector, seed_title = seed_metadata
+    warc_row = [seed_title,
+                seed_collector,
+                warc['filename'],
+                warc['collection'],
+                seed_id,
+                warc['crawl'],
+                crawl_definition,
+                warc['store-time'],
+                warc['crawl-start'],
+                warc['crawl-time'],
+                size_to_gb(warc['size']),
+                warc['filetype'],
+                warc['checksums']['md5'],
+                warc['checksums']['sha1']]
+    return warc_row
+
+
+def get_collector_and_title(seed_data):
+    """Get the collector and title from the Partner API data for one seed.
+
+    Parameter:
+        seed_data : API data for the seed, or None if the seed is not in Archive-It
+
+    Returns:
+         Collector and Title or default text if either are not in the seed data.
+    """
+    # Gets the collector (department) from the seed data, or supplies default text if there is no department.
+    try:
+        collector = seed_data['metadata']['Collector'][0]['value']
+    except (KeyError, IndexError, TypeError):
+        collector = "No collector in Archive-It"
+
+    # Gets the title from the seed data, or supplies default text if there is no title.
+    try:
+        title = seed_data['metadata']['Title'][0]['value']
+    except (KeyError, IndexError, TypeError):
+        title = "No title in Archive-It"
+
+    return collector, title
+
+
 def get_crawl_definition(job):
     """Get the crawl definition id from the crawl job report.
 
@@ -67,21 +314,314 @@ def get_crawl_definition(job):
     Returns:
          Crawl Definition ID or default text if the ID cannot be obtained.
     """
+    return read_job_report(*get_job_report(job))
 
-    # Gets the crawl job report using the Partner API.
-    job_report = requests.get(f'{c.partner_api}/crawl_job?id={job}', auth=(c.username, c.password))
-    if not job_report.status_code == 200:
-        return "API Error for job report"
 
-    # Reads the crawl job report and extracts the crawl definition identifier.
-    py_job_report = job_report.json()
+def get_crawl_definition_batch(jobs, cache, chunk_size=100, workers=1, backend='threads', connection=None):
+    """Add the crawl definition for a list of crawl jobs to the crawl cache, using as few Partner API calls as possible.
+
+    Crawl jobs saved in the metadata cache (if configured) by a previous run are used instead of the API.
+    Jobs that cannot be requested in a batch, because the id is not a number or there was an API error,
+    are not added to the cache so get_crawl_definition_cached() will look them up individually.
+
+    Parameters:
+        jobs : list of Crawl Job IDs in Archive-It, which may include duplicates
+        cache : dictionary with the crawl jobs already looked up and the number of cache hits and misses
+        chunk_size : the most jobs to include in one API call
+        workers : the most API calls to make at the same time
+        backend : make the API calls with a pool of threads (threads) or asyncio (async)
+        connection : connection to the metadata cache, or None if there is no metadata cache
+
+    Returns:
+        Nothing
+    """
+    # Only looks up each job once, and only if it is not already cached and is a number.
+    # Jobs are strings in the cache, to match get_crawl_definition_cached().
+    new_jobs = sorted({str(job) for job in jobs if str(job) not in cache['jobs'] and str(job).isdigit()})
+
+    # Jobs that another page is requesting at the same time are waited for instead of requested again,
+    # and jobs that another page added to the cache since they were checked are skipped.
+    with in_flight_jobs.claim(new_jobs) as claimed_jobs:
+        new_jobs = [job for job in claimed_jobs if job not in cache['jobs']]
+
+        # Gets any jobs it can from the metadata cache, and the rest from the API, which are then saved to the cache.
+        # Jobs that are not in Archive-It are saved to the metadata cache as None so they are not requested again
+        # until the missing_cache_hours have passed (no limit by default).
+        job_records = fun.cache_get(connection, 'crawl_job', new_jobs)
+        api_jobs = [job for job in new_jobs if job not in job_records]
+        api_records, error_ids = get_partner_records('crawl_job', api_jobs, chunk_size, workers, backend)
+        fun.cache_save(connection, 'crawl_job', {job: api_records.get(job) for job in api_jobs if job not in error_ids})
+        add_api_ids(cache, [job for job in api_jobs if job not in error_ids])
+        job_records.update(api_records)
+
+        # Jobs that were not returned by the API are not in Archive-It, and get the default text of an empty report.
+        for job in new_jobs:
+            if job not in error_ids:
+                cache['jobs'][job] = get_definition_from_job(job_records.get(job))
+
+
+def get_crawl_definition_cached(job, cache):
+    """Get the crawl definition id for a crawl job, only using the Partner API the first time a job is looked up.
+
+    Parameters:
+        job : Crawl Job ID in Archive-It
+        cache : dictionary with the crawl jobs already looked up and the number of cache hits and misses
+
+    Returns:
+         Crawl Definition ID or default text if the ID cannot be obtained.
+    """
+    # The job is saved as a string so the cache has the same keys after it is saved to and read from a file.
+    job = str(job)
+
+    # If the job was already looked up, returns the saved crawl definition or error text.
+    if job in cache['jobs']:
+        count_lookup(cache, job)
+        return cache['jobs'][job]
+
+    # Otherwise, gets the crawl definition from the Partner API and saves it for the next WARC from this job.
+    count_lookup(cache, job, from_api=True)
+    cache['jobs'][job] = get_crawl_definition(job)
+    return cache['jobs'][job]
+
+
+def get_definition_from_job(job_data):
+    """Get the crawl definition id from the Partner API data for one crawl job.
+
+    Parameter:
+        job_data : API data for the crawl job, or None if the job is not in Archive-It
+
+    Returns:
+         Crawl Definition ID or default text if it is not in the job data.
+    """
     try:
-        crawl_definition = py_job_report[0]["crawl_definition"]
-        return crawl_definition
-    except (KeyError, IndexError):
+        return job_data["crawl_definition"]
+    except (KeyError, TypeError):
         return "Cannot get crawl definition: Job ID is not in Archive-It"
 
 
+@fun.single_flight
+def get_job_report(job):
+    """Get the crawl job report for one crawl job from the Partner API.
+
+    Threads that look up the same job at the same time share one API call (see fun.single_flight()).
+
+    Parameter:
+        job : Crawl Job ID in Archive-It
+
+    Returns:
+        The API status code and the crawl job report (json), which is None if there was an API error.
+    """
+    job_report = fun.api_get_hedged(f'{c.partner_api}/crawl_job?id={job}')
+    if not job_report.status_code == 200:
+        return job_report.status_code, None
+    return job_report.status_code, job_report.json()
+
+
+def get_metadata_async(seeds, jobs, seed_cache, crawl_cache, limit, connection=None):
+    """Look up every seed and crawl job that is not cached yet, one id per API call, using asyncio.
+
+    This uses the same API calls and reads the results with the same functions as get_metadata_concurrently(),
+    so the report is the same, but can have many more API calls waiting at once than is practical with threads.
+
+    Parameters:
+        seeds : list of Seed IDs in Archive-It, which may include duplicates
+        jobs : list of Crawl Job IDs in Archive-It, which may include duplicates
+        seed_cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        crawl_cache : dictionary with the crawl jobs already looked up and the number of cache hits and misses
+        limit : the most API calls to make at the same time
+        connection : connection to the metadata cache to save the results to, or None if there is no metadata cache
+
+    Returns:
+        Nothing
+    """
+    new_seeds = sorted({seed for seed in seeds if seed not in seed_cache['seeds']})
+    new_jobs = sorted({str(job) for job in jobs if str(job) not in crawl_cache['jobs']})
+
+    # Ids that another page is requesting at the same time are waited for instead of requested again,
+    # and ids that another page added to the cache since they were checked are skipped.
+    with in_flight_seeds.claim(new_seeds) as claimed_seeds, in_flight_jobs.claim(new_jobs) as claimed_jobs:
+        new_seeds = [seed for seed in claimed_seeds if seed not in seed_cache['seeds']]
+        new_jobs = [job for job in claimed_jobs if job not in crawl_cache['jobs']]
+
+        # Makes all the API calls in one event loop, and then reads the results and adds them to the caches.
+        api_calls = [(f"{c.partner_api}/seed?id={seed}", None) for seed in new_seeds]
+        api_calls.extend([(f"{c.partner_api}/crawl_job?id={job}", None) for job in new_jobs])
+        results = fun.get_json_async(api_calls, limit)
+        seed_reports = results[:len(new_seeds)]
+        job_reports = results[len(new_seeds):]
+        for seed, (status_code, py_seed_report) in zip(new_seeds, seed_reports):
+            seed_cache['seeds'][seed] = read_seed_report(status_code, py_seed_report)
+        for job, (status_code, py_job_report) in zip(new_jobs, job_reports):
+            crawl_cache['jobs'][job] = read_job_report(status_code, py_job_report)
+        add_api_ids(seed_cache, new_seeds)
+        add_api_ids(crawl_cache, new_jobs)
+        cache_reports(connection, 'seed', new_seeds, seed_reports)
+        cache_reports(connection, 'crawl_job', new_jobs, job_reports)
+
+
+def get_metadata_concurrently(seeds, jobs, seed_cache, crawl_cache, workers, connection=None):
+    """Look up every seed and crawl job that is not cached yet, one id per API call, using a pool of threads.
+
+    The lookups only wait on the Partner API, so using several threads makes them finish much sooner.
+    The results are added to the caches, which are then used to make the report rows in the original WASAPI order.
+
+    Parameters:
+        seeds : list of Seed IDs in Archive-It, which may include duplicates
+        jobs : list of Crawl Job IDs in Archive-It, which may include duplicates
+        seed_cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        crawl_cache : dictionary with the crawl jobs already looked up and the number of cache hits and misses
+        workers : the most API calls to make at the same time
+        connection : connection to the metadata cache to save the results to, or None if there is no metadata cache
+
+    Returns:
+        Nothing
+    """
+    new_seeds = sorted({seed for seed in seeds if seed not in seed_cache['seeds']})
+    new_jobs = sorted({str(job) for job in jobs if str(job) not in crawl_cache['jobs']})
+
+    # Ids that another page is requesting at the same time are waited for instead of requested again,
+    # and ids that another page added to the cache since they were checked are skipped.
+    with in_flight_seeds.claim(new_seeds) as claimed_seeds, in_flight_jobs.claim(new_jobs) as claimed_jobs:
+        new_seeds = [seed for seed in claimed_seeds if seed not in seed_cache['seeds']]
+        new_jobs = [job for job in claimed_jobs if job not in crawl_cache['jobs']]
+
+        # The threads in the pool only make the API calls, and the results are added to the caches here.
+        # Other pages can be enriched at the same time, so other threads may be adding to the caches too
+        # (see enrich_page()).
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            seed_reports = list(pool.map(get_seed_report, new_seeds))
+            job_reports = list(pool.map(get_job_report, new_jobs))
+        for seed, (status_code, py_seed_report) in zip(new_seeds, seed_reports):
+            seed_cache['seeds'][seed] = read_seed_report(status_code, py_seed_report)
+        for job, (status_code, py_job_report) in zip(new_jobs, job_reports):
+            crawl_cache['jobs'][job] = read_job_report(status_code, py_job_report)
+        add_api_ids(seed_cache, new_seeds)
+        add_api_ids(crawl_cache, new_jobs)
+        cache_reports(connection, 'seed', new_seeds, seed_reports)
+        cache_reports(connection, 'crawl_job', new_jobs, job_reports)
+
+
+def get_page_ids(warc_page, skip_filenames):
+    """Get the seed and crawl job ids for a page of WARCs, the seed-ID extraction stage of the report pipeline.
+
+    Parameters:
+        warc_page : list of WASAPI data for each WARC in the page
+        skip_filenames : WARC filenames that are already in the report, from the journal when resuming a run
+
+    Returns:
+        Tuple with the list of WARCs in the page that are not skipped, their seed ids, and their crawl job ids,
+        or None if every WARC in the page is skipped.
+    """
+    warc_page = [warc for warc in warc_page if warc['filename'] not in skip_filenames]
+    if len(warc_page) == 0:
+        return None
+    seed_ids = [calculate_seed_id(warc['filename']) for warc in warc_page]
+    crawl_jobs = [warc['crawl'] for warc in warc_page]
+    return warc_page, seed_ids, crawl_jobs
+
+
+def get_partner_chunk(record_type, chunk):
+    """Get Partner API data for one chunk of ids with the id__in filter.
+
+    Parameters:
+        record_type : type of Partner API data, for example seed or crawl_job
+        chunk : list of Archive-It ids, which must be numbers
+
+    Returns:
+        The API status code and the API data (json), which is None if there was an API error.
+    """
+    filters = {'id__in': ','.join(str(record_id) for record_id in chunk), 'limit': -1}
+    response = fun.api_get(f'{c.partner_api}/{record_type}', params=filters)
+    if not response.status_code == 200:
+        return response.status_code, None
+    return response.status_code, response.json()
+
+
+def get_partner_records(record_type, ids, chunk_size=100, workers=1, backend='threads'):
+    """Get Partner API data for a list of ids, requesting a chunk of ids at a time with the id__in filter.
+
+    Parameters:
+        record_type : type of Partner API data, for example seed or crawl_job
+        ids : list of Archive-It ids, which must be numbers
+        chunk_size : the most ids to include in one API call
+        workers : the most API calls to make at the same time
+        backend : make the API calls with a pool of threads (threads) or asyncio (async)
+
+    Returns:
+        Dictionary with the id (as a string) and API data for each id found,
+        and a list of the ids that could not be checked due to an API error.
+    """
+    records = {}
+    error_ids = []
+    chunks = [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+
+    # Gets the API data for every chunk, which is a list of the status code and data (or None) in chunk order.
+    if backend == 'async':
+        api_calls = [(f'{c.partner_api}/{record_type}',
+                      {'id__in': ','.join(str(record_id) for record_id in chunk), 'limit': -1}) for chunk in chunks]
+        chunk_results = fun.get_json_async(api_calls, workers)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunk_results = list(pool.map(get_partner_chunk, [record_type] * len(chunks), chunks))
+
+    for chunk, (status_code, chunk_records) in zip(chunks, chunk_results):
+        if chunk_records is None:
+            error_ids.extend(chunk)
+            continue
+        for record in chunk_records:
+            records[str(record['id'])] = record
+    return records, error_ids
+
+
+def get_results_in_order(function, arguments_list, workers):
+    """Run a function with each set of arguments using a pool of threads, and yield the results in the same order.
+
+    No more than workers function calls are waiting to be yielded at a time,
+    so the results are not all held in memory if the code using them is slower than the function.
+
+    Parameters:
+        function : the function to run
+        arguments_list : list of tuples with the arguments for each function call
+        workers : the most function calls to run at the same time
+
+    Returns:
+        Yields the result of each function call, or raises the error from the function call.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = deque()
+        next_call = 0
+        while len(running) > 0 or next_call < len(arguments_list):
+            while next_call < len(arguments_list) and len(running) < workers:
+                running.append(pool.submit(function, *arguments_list[next_call]))
+                next_call += 1
+            yield running.popleft().result()
+
+
+def get_seed_index(cache, connection=None):
+    """Add the collector and title for every seed in the account to the seed cache, with one Partner API call.
+
+    This is the same API call as the seed report. The seeds are also saved to the metadata cache (if configured),
+    along with the number of seeds in the account, which --seeds auto uses in later runs to choose a strategy.
+
+    Parameters:
+        cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        connection : connection to the metadata cache, or None if there is no metadata cache
+
+    Returns:
+        True if the seeds were added, or False if there was an API error.
+    """
+    response = fun.api_get(f'{c.partner_api}/seed', params={'limit': -1})
+    if not response.status_code == 200:
+        return False
+    seeds = {str(seed['id']): seed for seed in response.json()}
+    fun.cache_save(connection, 'seed', seeds)
+    fun.cache_save_count(connection, 'seed', len(seeds))
+    for seed, seed_data in seeds.items():
+        cache['seeds'][seed] = get_collector_and_title(seed_data)
+    add_api_ids(cache, seeds)
+    return True
+
+
 def get_seed_metadata(seed):
     """Get the collector and title from the seed report.
 
@@ -91,55 +631,382 @@ def get_seed_metadata(seed):
     Returns:
          Collector and Title or default text if either are not obtained.
     """
+    return read_seed_report(*get_seed_report(seed))
+
+
+def get_seed_metadata_batch(seeds, cache, chunk_size=100, workers=1, backend='threads', connection=None):
+    """Add the collector and title for a list of seeds to the seed cache, using as few Partner API calls as possible.
+
+    Seeds saved in the metadata cache (if configured) by this or another script are used instead of the API.
+    Seeds that cannot be requested in a batch, because the id could not be calculated or there was an API error,
+    are not added to the cache so get_seed_metadata_cached() will look them up individually.
+
+    Parameters:
+        seeds : list of Seed IDs in Archive-It, which may include duplicates
+        cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        chunk_size : the most seeds to include in one API call
+        workers : the most API calls to make at the same time
+        backend : make the API calls with a pool of threads (threads) or asyncio (async)
+        connection : connection to the metadata cache, or None if there is no metadata cache
+
+    Returns:
+        Nothing
+    """
+    # Gets any seeds it can from the metadata cache, and the rest from the API, which are then saved to the cache.
+    # Only looks up each seed once, and only if it is not already cached and is a number.
+    # Seeds that are not in Archive-It (deleted) are saved to the metadata cache as None so they are not requested
+    # again until the missing_cache_hours have passed.
+    # Seeds that another page is requesting at the same time are waited for instead of requested again,
+    # and seeds that another page added to the cache since they were checked are skipped.
+    new_seeds = [seed for seed in get_seed_metadata_saved(seeds, cache, connection) if seed.isdigit()]
+    with in_flight_seeds.claim(new_seeds) as claimed_seeds:
+        api_seeds = [seed for seed in claimed_seeds if seed not in cache['seeds']]
+        api_records, error_ids = get_partner_records('seed', api_seeds, chunk_size, workers, backend)
+        fun.cache_save(connection, 'seed', {seed: api_records.get(seed) for seed in api_seeds if seed not in error_ids})
+        add_api_ids(cache, [seed for seed in api_seeds if seed not in error_ids])
+
+        # Seeds that were not returned by the API have been deleted, and get the same default text as an empty report.
+        for seed in api_seeds:
+            if seed not in error_ids:
+                cache['seeds'][seed] = get_collector_and_title(api_records.get(seed))
+
+
+def get_seed_metadata_cached(seed, cache):
+    """Get the collector and title for a seed, only using the Partner API the first time a seed is looked up.
+
+    Parameters:
+        seed : Seed ID in Archive-It
+        cache : dictionary with the seeds already looked up and the number of cache hits and misses
+
+    Returns:
+         Collector and Title or default text if either are not obtained.
+    """
+    # If the seed was already looked up during this run, returns the saved collector and title.
+    if seed in cache['seeds']:
+        count_lookup(cache, seed)
+        return cache['seeds'][seed]
+
+    # Otherwise, gets the collector and title from the Partner API and saves them for the next WARC from this seed.
+    count_lookup(cache, seed, from_api=True)
+    cache['seeds'][seed] = get_seed_metadata(seed)
+    return cache['seeds'][seed]
+
 
-    # Gets the seed report using the Partner API.
-    seed_report = requests.get(f"{c.partner_api}/seed?id={seed}", auth=(c.username, c.password))
+def get_seed_metadata_saved(seeds, cache, connection=None):
+    """Add the collector and title for seeds saved in the metadata cache (if configured) to the seed cache.
+
+    This includes seeds saved as not being in Archive-It (deleted), which get the same default text
+    as an empty seed report.
+
+    Parameters:
+        seeds : list of Seed IDs in Archive-It, which may include duplicates
+        cache : dictionary with the seeds already looked up and the number of cache hits and misses
+        connection : connection to the metadata cache, or None if there is no metadata cache
+
+    Returns:
+        List of the seeds that are in neither cache, without duplicates, which need the Partner API.
+    """
+    new_seeds = sorted({seed for seed in seeds if seed not in cache['seeds']})
+    seed_records = fun.cache_get(connection, 'seed', [seed for seed in new_seeds if seed.isdigit()])
+    for seed, seed_data in seed_records.items():
+        cache['seeds'][seed] = get_collector_and_title(seed_data)
+    return [seed for seed in new_seeds if seed not in seed_records]
+
+
+@fun.single_flight
+def get_seed_report(seed):
+    """Get the seed report for one seed from the Partner API.
+
+    Threads that look up the same seed at the same time share one API call (see fun.single_flight()).
+
+    Parameter:
+        seed : Seed ID in Archive-It
+
+    Returns:
+        The API status code and the seed report (json), which is None if there was an API error.
+    """
+    seed_report = fun.api_get_hedged(f"{c.partner_api}/seed?id={seed}")
     if not seed_report.status_code == 200:
-        return f"Cannot get collector. API error {seed_report.status_code} for seed report.", \
-               f"Cannot get title. API error {seed_report.status_code} for seed report."
-    py_seed_report = seed_report.json()
+        return seed_report.status_code, None
+    return seed_report.status_code, seed_report.json()
 
-    # Gets the collector (department) from the seed report, or supplies default text if there is no department.
-    try:
-        collector = py_seed_report[0]['metadata']['Collector'][0]['value']
-    except (KeyError, IndexError):
-        collector = "No collector in Archive-It"
 
-    # Gets the title from the seed report, or supplies default text if there is no title.
-    try:
-        title = py_seed_report[0]['metadata']['Title'][0]['value']
-    except (KeyError, IndexError):
-        title = "No title in Archive-It"
+def get_warc_metadata(start, end, page_size=500, page_workers=1):
+    """Get metadata for all WARCs stored during the specified date range, one WASAPI page at a time.
 
-    return collector, title
+    This is a generator, so only a few pages of WARC metadata are in memory at a time.
+    Once the first page gives the number of WARCs, the remaining pages can be requested several at a time,
+    but are always yielded in page order.
+
+    WASAPI lists the newest WARCs first, so if WARCs are stored during the run (the date range includes today),
+    the WARCs already requested move to later pages. Any WARC that was already yielded is skipped,
+    and if a page has a larger number of WARCs than the first page, the extra pages at the end are also requested.
+
+    Parameters:
+        start : first store date of WARCs to include.
+        end : first store date of WARCs NOT to include (last date included is the day before end_date).
+        page_size : the number of WARCs to get with each API call.
+        page_workers : the most pages to request at the same time.
+
+    Returns:
+         Yields a list of WARC metadata (json) for each page, or raises a value error.
+    """
+    filenames = set()
+
+    def new_warcs(warc_page):
+        # Only includes WARCs that were not on an earlier page.
+        warcs = [warc for warc in warc_page['files'] if warc['filename'] not in filenames]
+        filenames.update(warc['filename'] for warc in warcs)
+        return warcs
+
+    # Gets the first page, which includes the number of WARCs (count) and so the number of pages.
+    first_page = get_warc_page(start, end, page_size, 1)
+    yield new_warcs(first_page)
+    count = first_page['count']
+
+    # Gets the rest of the pages, requesting up to page_workers pages at a time,
+    # until there are no more pages for the largest count from any page.
+    # With one page worker, this gets one page at a time.
+    next_page = 2
+    while next_page <= math.ceil(count / page_size):
+        last_page = math.ceil(count / page_size)
+        page_arguments = [(start, end, page_size, page) for page in range(next_page, last_page + 1)]
+        for warc_page in get_results_in_order(get_warc_page, page_arguments, page_workers):
+            count = max(count, warc_page['count'])
+            yield new_warcs(warc_page)
+        next_page = last_page + 1
+
+
+def get_warc_metadata_cached(start, end, page_size=500, page_workers=1):
+    """Get metadata for all WARCs stored during the specified date range, using the WASAPI cache if possible.
+
+    WARCs stored in the past do not change, so a date range that ends before today is saved to the cache_folder
+    (if configured) the first time it is requested from WASAPI, and read from there after that.
+    A date range that includes today is always requested from WASAPI, since more WARCs may still be stored.
+
+    Parameters:
+        start : first store date of WARCs to include.
+        end : first store date of WARCs NOT to include (last date included is the day before end_date).
+        page_size : the number of WARCs to get with each API call, and to yield at a time from the cache.
+        page_workers : the most pages to request at the same time.
+
+    Returns:
+         Yields a list of WARC metadata (json) for each page, or raises a value error.
+    """
+    cache_path = get_window_cache_path(start, end)
+
+    # Reads the WARC metadata from the cache, which has one WARC per line, a page at a time.
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as cache_file:
+            warc_page = []
+            for line in cache_file:
+                warc_page.append(json.loads(line))
+                if len(warc_page) == page_size:
+                    yield warc_page
+                    warc_page = []
+            if len(warc_page) > 0:
+                yield warc_page
+        return
 
+    # Gets the WARC metadata from WASAPI, saving it to a temporary file if the date range can be cached.
+    # The temporary file is only renamed to the cache path once every page has been saved,
+    # so an incomplete date range is never read from the cache.
+    if not cache_path:
+        yield from get_warc_metadata(start, end, page_size, page_workers)
+        return
+    with open(f'{cache_path}.tmp', 'w') as cache_file:
+        for warc_page in get_warc_metadata(start, end, page_size, page_workers):
+            for warc in warc_page:
+                cache_file.write(json.dumps(warc) + '\n')
+            yield warc_page
+    os.replace(f'{cache_path}.tmp', cache_path)
 
-def get_warc_metadata(start, end):
-    """Get metadata for all WARCs stored during the specified date range.
+
+def get_warc_metadata_sharded(start, end, shard, page_size=500, workers=1):
+    """Get metadata for all WARCs stored during the specified date range, splitting it into smaller date windows.
+
+    Each window is a separate WASAPI request, so the requests are small and a window with an error is retried
+    without getting the other windows again. The windows are requested at the same time (up to workers)
+    and yielded in order, newest first, which is the same order as WASAPI uses for WARCs.
 
     Parameters:
         start : first store date of WARCs to include.
         end : first store date of WARCs NOT to include (last date included is the day before end_date).
+        shard : the size of each window, daily, weekly, or monthly.
+        page_size : the number of WARCs to get with each API call.
+        workers : the most windows to request at the same time.
 
     Returns:
-         WARC metadata (json) or raises a value error.
+         Yields a list of WARC metadata (json) for each window, or raises a value error.
     """
+    # Any WARC included in more than one window is only yielded the first time.
+    filenames = set()
+    window_arguments = [(window_start, window_end, page_size) for window_start, window_end
+                        in split_date_range(start, end, shard)]
+    for window_warcs in get_results_in_order(get_window_warcs, window_arguments, workers):
+        new_warcs = []
+        for warc in window_warcs:
+            if warc['filename'] not in filenames:
+                filenames.add(warc['filename'])
+                new_warcs.append(warc)
+        yield new_warcs
+
 
-    # Gets the data from WASAPI using a page size (number of WARCs) that is typically sufficient.
-    filters = {'store-time-after': start, 'store-time-before': end, 'page_size': 500}
-    warc_data = requests.get(c.wasapi, params=filters, auth=(c.username, c.password))
-    if not warc_data.status_code == 200:
-        raise ValueError
+def get_warc_page(start, end, page_size, page):
+    """Get one page of metadata from WASAPI for the WARCs stored during the specified date range.
 
-    # If there were more WARCs in the date range (the count) than the page size,
-    # gets the data again from WASAPI with an updated page size to get them all.
-    if warc_data.json()['count'] > 500:
-        filters = {'store-time-after': start, 'store-time-before': end, 'page_size': warc_data.json()['count']}
-        warc_data = requests.get(c.wasapi, params=filters, auth=(c.username, c.password))
+    Pages are requested by number instead of using the next link, which is http and would send the credentials
+    unencrypted. The response is parsed as it arrives (see fun.read_json_stream()),
+    so large pages are never held in memory as text.
+
+    Parameters:
+        start : first store date of WARCs to include.
+        end : first store date of WARCs NOT to include (last date included is the day before end_date).
+        page_size : the number of WARCs on each page.
+        page : the page number, starting with 1.
+
+    Returns:
+         WASAPI data for the page (json) or raises a value error.
+    """
+    filters = {'store-time-after': start, 'store-time-before': end, 'page_size': page_size, 'page': page}
+    try:
+        warc_data = fun.api_get(c.wasapi, params=filters, stream=True)
+    except requests.exceptions.RequestException as error:
+        raise ValueError(f"WASAPI API error for page {page}: {error}")
+    with warc_data:
         if not warc_data.status_code == 200:
-            raise ValueError
+            raise ValueError(f"WASAPI API error {warc_data.status_code} for page {page}.")
+        page_data = {}
+        try:
+            page_data['files'] = list(fun.read_json_stream(warc_data.iter_content(chunk_size=65536), 'files',
+                                                           page_data))
+        except (requests.exceptions.RequestException, ValueError) as error:
+            raise ValueError(f"WASAPI API error for page {page}: {error}")
+    return page_data
+
 
-    return warc_data.json()
+def get_window_cache_path(start, end):
+    """Get the path to the WASAPI cache file for a date range, if the date range can be cached.
+
+    Parameters:
+        start : first store date of WARCs to include.
+        end : first store date of WARCs NOT to include (last date included is the day before end_date).
+
+    Returns:
+         Path to the cache file, or None if there is no cache_folder or the date range includes today or later.
+    """
+    # WASAPI store times are in UTC, so today is also calculated in UTC.
+    today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+    if not hasattr(c, 'cache_folder') or end > today:
+        return None
+    return os.path.join(c.cache_folder, f'wasapi_{start}_{end}.jsonl')
+
+
+def get_window_warcs(start, end, page_size, attempts=3):
+    """Get metadata for all WARCs stored during one date window, trying again if there is a WASAPI API error.
+
+    Windows before today are read from the WASAPI cache, if they were saved by a previous run.
+
+    Parameters:
+        start : first store date of WARCs to include.
+        end : first store date of WARCs NOT to include (last date included is the day before end_date).
+        page_size : the number of WARCs to get with each API call.
+        attempts : the most times to try getting the window.
+
+    Returns:
+         List of WARC metadata (json) or raises a value error if every attempt had an API error.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return [warc for warc_page in get_warc_metadata_cached(start, end, page_size) for warc in warc_page]
+        except ValueError:
+            if attempt == attempts:
+                raise
+
+
+def read_journal(journal_path):
+    """Get the rows saved to the checkpoint journal by an earlier run of the script, to resume that run.
+
+    Each line of the journal is one finished WARC: its filename and its report row, as JSON.
+    A line that is not complete JSON, which happens if the script stopped while saving it, is skipped
+    so that WARC is done again.
+
+    Parameter:
+        journal_path : path to the journal, which may not exist if the earlier run did not save any rows
+
+    Returns:
+        Dictionary with the WARC filename as the key and the list of values for its report row as the value.
+    """
+    rows = {}
+    if not os.path.exists(journal_path):
+        return rows
+    with open(journal_path) as journal:
+        for line in journal:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            rows[entry['filename']] = entry['row']
+    return rows
+
+
+def read_job_report(status_code, py_job_report):
+    """Get the crawl definition id from the crawl job report returned by the Partner API.
+
+    Parameters:
+        status_code : API status code for the crawl job report
+        py_job_report : crawl job report (json), or None if there was an API error
+
+    Returns:
+         Crawl Definition ID or default text if the ID cannot be obtained.
+    """
+    if not status_code == 200:
+        return "API Error for job report"
+
+    # The crawl job report is empty if the job is not in Archive-It.
+    if len(py_job_report) == 0:
+        return get_definition_from_job(None)
+    return get_definition_from_job(py_job_report[0])
+
+
+def read_seed_report(status_code, py_seed_report):
+    """Get the collector and title from the seed report returned by the Partner API.
+
+    Parameters:
+        status_code : API status code for the seed report
+        py_seed_report : seed report (json), or None if there was an API error
+
+    Returns:
+         Collector and Title or default text if either are not obtained.
+    """
+    if not status_code == 200:
+        return f"Cannot get collector. API error {status_code} for seed report.", \
+               f"Cannot get title. API error {status_code} for seed report."
+
+    # The seed report is empty if the seed was deleted from Archive-It.
+    if len(py_seed_report) == 0:
+        return get_collector_and_title(None)
+    return get_collector_and_title(py_seed_report[0])
+
+
+def save_journal(journal_path, warc_page, rows):
+    """Save the filename and report row of each finished WARC in a page to the checkpoint journal.
+
+    The journal is synced to the disk before returning, so the rows are kept even if the script stops right after.
+
+    Parameters:
+        journal_path : path to the journal, which is made if it does not exist
+        warc_page : list of the WASAPI data for each WARC in the page
+        rows : list of the report rows for the WARCs, in the same order as warc_page
+
+    Returns:
+        None
+    """
+    with open(journal_path, 'a') as journal:
+        for warc, row in zip(warc_page, rows):
+            journal.write(json.dumps({'filename': warc['filename'], 'row': row}) + '\n')
+        journal.flush()
+        os.fsync(journal.fileno())
 
 
 def size_to_gb(size_bytes):
@@ -157,6 +1024,36 @@ def size_to_gb(size_bytes):
     return size
 
 
+def split_date_range(start, end, shard):
+    """Split a date range into daily, weekly, or monthly windows.
+
+    Parameters:
+        start : first date of the range, formatted YYYY-MM-DD.
+        end : first date NOT in the range, formatted YYYY-MM-DD.
+        shard : the size of each window, daily, weekly, or monthly. Monthly windows are calendar months.
+
+    Returns:
+         List of tuples with the start and end date of each window, newest first.
+         Like the date range, the end date is the first date NOT in the window.
+    """
+    windows = []
+    window_start = datetime.strptime(start, '%Y-%m-%d')
+    range_end = datetime.strptime(end, '%Y-%m-%d')
+    while window_start < range_end:
+        if shard == 'daily':
+            window_end = window_start + timedelta(days=1)
+        elif shard == 'weekly':
+            window_end = window_start + timedelta(days=7)
+        else:
+            window_end = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        window_end = min(window_end, range_end)
+        windows.append((window_start.strftime('%Y-%m-%d'), window_end.strftime('%Y-%m-%d')))
+        window_start = window_end
+
+    windows.reverse()
+    return windows
+
+
 def verify_dates(argument_list):
     """Verify the two required arguments (start and end date) are present and correct.
 
@@ -200,6 +1097,67 @@ def verify_dates(argument_list):
     return start, end, errors
 
 
+def verify_options(argument_list):
+    """Verify the optional arguments, which are after the start and end date, are correct.
+
+    Parameter:
+        argument_list : value of sys.argv
+
+    Returns:
+         Dictionary with the value of each option and errors list (which is empty if there were no errors).
+    """
+    options = {'workers': 1, 'backend': 'threads', 'page_size': 500, 'page_workers': 1, 'shard': None,
+               'resume': False, 'adaptive': False, 'hedge': False, 'seeds': 'auto'}
+    errors = []
+
+    # Optional arguments that are followed by a whole number, and the key for the option in the options dictionary.
+    number_options = {'--workers': 'workers', '--page-size': 'page_size', '--page-workers': 'page_workers'}
+
+    # Checks each optional argument is a known option and is followed by a correctly formatted value.
+    arguments = list(argument_list[3:])
+    while len(arguments) > 0:
+        option = arguments.pop(0)
+        # With auto workers, the most workers is the connection pool size and the concurrency adapts up to that.
+        if option == '--workers' and len(arguments) > 0 and arguments[0] == 'auto':
+            arguments.pop(0)
+            options['workers'] = fun.get_setting('http_pool_size', 20)
+            options['adaptive'] = True
+        elif option in number_options:
+            value = arguments.pop(0) if len(arguments) > 0 else ''
+            if value.isdigit() and int(value) > 0:
+                options[number_options[option]] = int(value)
+            else:
+                errors.append(f"Value '{value}' for {option} is not a whole number greater than 0.")
+        elif option == '--backend':
+            value = arguments.pop(0) if len(arguments) > 0 else ''
+            if value == 'async' and fun.aiohttp is None:
+                errors.append("The async backend requires aiohttp, which is not installed.")
+            elif value in ('threads', 'async'):
+                options['backend'] = value
+            else:
+                errors.append(f"Value '{value}' for --backend is not threads or async.")
+        elif option == '--shard':
+            value = arguments.pop(0) if len(arguments) > 0 else ''
+            if value in ('daily', 'weekly', 'monthly'):
+                options['shard'] = value
+            else:
+                errors.append(f"Value '{value}' for --shard is not daily, weekly, or monthly.")
+        elif option == '--seeds':
+            value = arguments.pop(0) if len(arguments) > 0 else ''
+            if value in ('auto', 'per-id', 'batch', 'index'):
+                options['seeds'] = value
+            else:
+                errors.append(f"Value '{value}' for --seeds is not auto, per-id, batch, or index.")
+        elif option == '--resume':
+            options['resume'] = True
+        elif option == '--hedge':
+            options['hedge'] = True
+        else:
+            errors.append(f"Optional argument '{option}' is not recognized.")
+
+    return options, errors
+
+
 if __name__ == '__main__':
 
     # Verifies the configuration file has the correct values.
@@ -208,45 +1166,111 @@ if __name__ == '__main__':
     # Gets the date range for WARCs to include in the CSV from the script arguments and any errors.
     # If there were errors, quits the script.
     start_date, end_date, errors_list = verify_dates(sys.argv)
+    options, option_errors = verify_options(sys.argv)
+    errors_list.extend(option_errors)
     if len(errors_list) > 0:
         print("\nThe following errors were detected with the script arguments.")
         for error in errors_list:
             print(f"    * {error}")
         sys.exit()
 
-    # Gets the WARC data from WASAPI and converts to Python.
-    # If there was an API error, quits the script.
-    try:
-        metadata = get_warc_metadata(start_date, end_date)
-    except ValueError:
-        print("\nCould not get the WARC metadata due to a WASAPI API error.")
-        sys.exit()
-
-    # Makes a CSV for the warc metadata report with a header row.
-    # The date range in the file name is the dates WARCs could have been stored,
+    # The report and journal names include the date range the WARCs could have been stored,
     # which is one day sooner than the end_date due to how the API works.
     warc_last_date = (datetime.strptime(end_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
     report_path = f"{c.script_output}/warc_metadata_{start_date}_{warc_last_date}.csv"
-    fun.save_csv_row(report_path, ["AIP_Title", "Department", "WARC_Filename", "AIT_Collection_ID", "Seed_ID",
-                                   "Crawl_Job_ID", "Crawl_Definition_ID", "Date_Store-Time", "Date_Crawl-Start",
-                                   "Date_Crawl-End", "Size_GB", "File_Type", "MD5_Checksum", "SHA1_Checksum"])
-
-    # Saves the metadata for each WARC to the WARC metadata report.
-    for warc in metadata['files']:
-        seed_id = calculate_seed_id(warc['filename'])
-        seed_collector, seed_title = get_seed_metadata(seed_id)
-        warc_row = [seed_title,
-                    seed_collector,
-                    warc['filename'],
-                    warc['collection'],
-                    seed_id,
-                    warc['crawl'],
-                    get_crawl_definition(warc['crawl']),
-                    warc['store-time'],
-                    warc['crawl-start'],
-                    warc['crawl-time'],
-                    size_to_gb(warc['size']),
-                    warc['filetype'],
-                    warc['checksums']['md5'],
-                    warc['checksums']['sha1']]
-        fun.save_csv_row(report_path, warc_row)
+
+    # Seeds and crawl jobs often have more than one WARC, so their metadata is cached to only get it once.
+    # Seeds and crawl jobs are also saved to the metadata cache in the cache_folder (if configured)
+    # so they can be used by the next run or another script.
+    # Each WARC counts as one lookup, which is a miss if it is the first WARC to use an id from the Partner API
+    # (api_ids) and otherwise a hit.
+    # The caches are changed by every page being enriched at the same time (see enrich_page() for why that is safe).
+    seed_cache = {'seeds': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+    crawl_cache = {'jobs': {}, 'api_ids': set(), 'hits': 0, 'misses': 0}
+    cache_connection = fun.cache_connect()
+
+    # The number of Partner API calls made at the same time is limited to workers for the whole script,
+    # not for each page, since several pages can be enriched at the same time, each with its own threads.
+    # With auto workers, the limit is adjusted while the script runs, based on the response times and API errors.
+    if options['adaptive']:
+        fun.concurrency_controllers['partner_api'] = fun.ConcurrencyController(options['workers'])
+    else:
+        fun.concurrency_controllers['partner_api'] = fun.ConcurrencyController(options['workers'], options['workers'],
+                                                                               options['workers'])
+
+    # Seeds are looked up with the seeds option: one id per API call (per-id), 100 ids per API call (batch),
+    # or every seed in the account with one API call (index), and any seeds not in the index (added since) in a batch.
+    # With auto, a strategy is picked for each page based on how many seeds need the Partner API
+    # (see choose_seed_strategy()). The number of seeds in the account is the number saved to the metadata cache
+    # by the seed report, if any. Without it, index is not used.
+    seed_state = {'api_seeds': set(), 'account_seeds': fun.cache_count(cache_connection, 'seed'), 'index_tried': False,
+                  'lock': threading.Lock()}
+
+    # With the hedge option, seeds and crawl jobs looked up one at a time with threads get a duplicate API call
+    # if the response is much slower than usual, to reduce how long the slowest lookups take.
+    if options['hedge']:
+        fun.hedger = fun.RequestHedger(fun.get_setting('hedge_percentile', 95),
+                                       fun.get_setting('hedge_max_extra', 0.05))
+
+    # The row for each finished WARC is also saved to a checkpoint journal, one page at a time.
+    # With the resume option, the rows in the journal from an earlier run that did not finish are added to the report
+    # and those WARCs are skipped, so their metadata is not requested again.
+    # Otherwise, any journal from an earlier run is deleted.
+    journal_path = f"{c.script_output}/warc_metadata_{start_date}_{warc_last_date}_journal.jsonl"
+    if options['resume']:
+        journal_rows = read_journal(journal_path)
+        print(f"\nResuming with {len(journal_rows)} WARCs from the journal.")
+    else:
+        journal_rows = {}
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+    # Gets the WARC data from WASAPI (or the WASAPI cache) one page at a time and saves the metadata for each WARC
+    # to the report and the journal, using a pipeline where each step works on a different page at the same time:
+    # getting the page, getting the seed and crawl job ids (get_page_ids()), getting the seed and crawl job metadata
+    # from the caches and the Partner API (enrich_page()), making the rows (format_rows()), and saving the rows (here).
+    # Up to page_workers pages are enriched at the same time, and a page that finishes before the pages ahead of it
+    # waits in a reorder buffer, so the rows are always saved in the WASAPI order.
+    # Only a few pages are waiting between steps at a time, and enrichment pauses if the reorder buffer is full.
+    # With the shard option, the date range is split into smaller windows and each window is used as a page.
+    if options['shard']:
+        warc_pages = get_warc_metadata_sharded(start_date, end_date, options['shard'], options['page_size'],
+                                               options['page_workers'])
+    else:
+        warc_pages = get_warc_metadata_cached(start_date, end_date, options['page_size'], options['page_workers'])
+    stages = [functools.partial(get_page_ids, skip_filenames=journal_rows),
+              (functools.partial(enrich_page, seed_cache=seed_cache, crawl_cache=crawl_cache, options=options,
+                                 seed_state=seed_state, connection=cache_connection), options['page_workers']),
+              format_rows]
+
+    # Makes a CSV for the warc metadata report with a header row and any rows from the journal.
+    # The report stays open while the rows are added, which are saved in batches.
+    # If the script stops before the report is complete, for any reason, the incomplete report is deleted.
+    # If there was a WASAPI or Partner API error that did not go away when the API call was tried again,
+    # or the API data could not be read, prints the error and quits the script.
+    # The journal is kept so the script can be run again with the resume option.
+    with fun.ReportWriter(report_path) as report:
+        report.writerow(["AIP_Title", "Department", "WARC_Filename", "AIT_Collection_ID", "Seed_ID", "Crawl_Job_ID",
+                         "Crawl_Definition_ID", "Date_Store-Time", "Date_Crawl-Start", "Date_Crawl-End", "Size_GB",
+                         "File_Type", "MD5_Checksum", "SHA1_Checksum"])
+        report.writerows(list(journal_rows.values()))
+        try:
+            for warc_page, rows in fun.run_pipeline(warc_pages, stages):
+                save_journal(journal_path, warc_page, rows)
+                report.writerows(rows)
+        except (ValueError,) + fun.api_errors as error:
+            print("\nCould not get the WARC metadata due to an API error or API data that could not be read.")
+            print(f"    {type(error).__name__}: {error}")
+            print("Run the script again with --resume to continue from the last saved WARC.")
+            sys.exit()
+
+    # The report is complete, so the journal is no longer needed.
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+
+    # Prints how many seed and crawl job lookups used the cache instead of the Partner API.
+    print(f"\nSeed lookups: {seed_cache['hits']} from the cache and {seed_cache['misses']} from the Partner API.")
+    print(f"Crawl job lookups: {crawl_cache['hits']} from the cache and {crawl_cache['misses']} from the Partner API.")
+    if options['adaptive']:
+        limit = int(fun.concurrency_controllers['partner_api'].limit)
+        print(f"Partner API calls at the same time by the end: {limit}.")